@@ -0,0 +1,239 @@
+"""협업 필터링 모델 빌드/로드
+
+요청마다 전체 유저-게시글 행렬로 SVD를 돌리지 않도록,
+잠재요인(latent factor)을 오프라인에서 학습해 버전별 .npy 파일로 저장합니다.
+추천 요청은 현재 버전의 모델을 불러와 한 유저의 행만 계산합니다.
+
+디렉토리 구조:
+    RECOMMEND_MODEL_DIR/
+        CURRENT                 현재 사용중인 버전 이름
+        <version>/user_ids.npy  행(유저) pk
+        <version>/article_ids.npy  열(게시글) pk
+        <version>/user_factors.npy  U * sigma
+        <version>/article_factors.npy  V
+        <version>/user_means.npy  유저별 평균 score
+"""
+import os
+import shutil
+import threading
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import LinearOperator, svds
+from django.conf import settings
+from django.utils import timezone
+from articles.models import Article
+from users.models import User
+
+CURRENT_FILE = "CURRENT"
+ARRAY_NAMES = (
+    "user_ids",
+    "article_ids",
+    "user_factors",
+    "article_factors",
+    "user_means",
+)
+# 최대 잠재요인 개수
+MAX_FACTORS = 12
+# 보관할 이전 버전 개수(롤백용)
+KEEP_VERSIONS = 3
+
+
+def get_model_dir():
+    return str(settings.RECOMMEND_MODEL_DIR)
+
+
+class CollaborativeModel:
+    """학습된 협업 필터링 모델
+
+    Attributes:
+        version(str) : 모델 버전(빌드 시각)
+        user_ids(ndarray) : 행 순서대로의 유저 pk
+        article_ids(ndarray) : 열 순서대로의 게시글 pk
+        user_factors(ndarray) : (유저 수, k) U * sigma
+        article_factors(ndarray) : (게시글 수, k) V
+        user_means(ndarray) : 유저별 평균 score
+    """
+
+    def __init__(
+        self, version, user_ids, article_ids, user_factors, article_factors, user_means
+    ):
+        self.version = version
+        self.user_ids = user_ids
+        self.article_ids = article_ids
+        self.user_factors = user_factors
+        self.article_factors = article_factors
+        self.user_means = user_means
+        self.user_index = {pk: row for row, pk in enumerate(user_ids.tolist())}
+
+    def predict(self, user_id):
+        """한 유저의 모든 게시글에 대한 예상 score를 반환합니다. 모델에 없는 유저는 None"""
+        row = self.user_index.get(user_id)
+        if row is None:
+            return None
+        return self.article_factors @ self.user_factors[row] + self.user_means[row]
+
+    def save(self, model_dir):
+        path = os.path.join(model_dir, self.version)
+        os.makedirs(path, exist_ok=True)
+        for name in ARRAY_NAMES:
+            np.save(os.path.join(path, name + ".npy"), getattr(self, name))
+
+    @classmethod
+    def load(cls, model_dir, version):
+        path = os.path.join(model_dir, version)
+        arrays = {
+            name: np.load(os.path.join(path, name + ".npy")) for name in ARRAY_NAMES
+        }
+        return cls(version, **arrays)
+
+
+def interaction_matrix(user_ids, article_ids):
+    """유저 x 게시글 score 희소행렬(CSR)을 만듭니다. (좋아요 2점, 북마크 4점)
+
+    Like/Bookmark 중간 테이블 행을 그대로 읽어 만들기 때문에
+    메모리는 (유저 수 x 게시글 수)가 아니라 좋아요/북마크 개수에 비례합니다.
+    """
+    rows, cols, data = [], [], []
+    for through, score in (
+        (Article.like.through, 2.0),
+        (Article.bookmark.through, 4.0),
+    ):
+        pairs = np.array(
+            through.objects.values_list("user_id", "article_id"), dtype=np.int64
+        ).reshape(-1, 2)
+        rows.append(pairs[:, 0])
+        cols.append(pairs[:, 1])
+        data.append(np.full(len(pairs), score))
+    rows, cols, data = np.concatenate(rows), np.concatenate(cols), np.concatenate(data)
+
+    # pk -> 행/열 번호. user_ids, article_ids는 정렬되어 있어야 합니다.
+    row_index = np.searchsorted(user_ids, rows)
+    col_index = np.searchsorted(article_ids, cols)
+    valid = (
+        (row_index < len(user_ids))
+        & (col_index < len(article_ids))
+        & (user_ids[np.minimum(row_index, len(user_ids) - 1)] == rows)
+        & (article_ids[np.minimum(col_index, len(article_ids) - 1)] == cols)
+    )
+    # 중복된 (유저, 게시글) score는 CSR 변환시 합산됩니다.
+    return sparse.coo_matrix(
+        (data[valid], (row_index[valid], col_index[valid])),
+        shape=(len(user_ids), len(article_ids)),
+    ).tocsr()
+
+
+def user_mean_centered(matrix, user_means):
+    """matrix - user_means를 밀집행렬로 만들지 않고 LinearOperator로 표현합니다."""
+    ones = np.ones(matrix.shape[1])
+    matrix_t = matrix.T.tocsr()
+
+    def matvec(x):
+        x = np.ravel(x)
+        return matrix @ x - user_means * x.sum()
+
+    def rmatvec(y):
+        y = np.ravel(y)
+        return matrix_t @ y - ones * (user_means @ y)
+
+    return LinearOperator(
+        matrix.shape, matvec=matvec, rmatvec=rmatvec, dtype=np.float64
+    )
+
+
+def train_collaborative_model(version=None):
+    """DB의 좋아요/북마크로 잠재요인을 학습합니다. 저장은 하지 않습니다."""
+    version = version or timezone.now().strftime("%Y%m%d%H%M%S%f")
+    user_ids = np.array(
+        User.objects.order_by("pk").values_list("pk", flat=True), dtype=np.int64
+    )
+    article_ids = np.array(
+        Article.objects.order_by("pk").values_list("pk", flat=True), dtype=np.int64
+    )
+    if len(user_ids) and len(article_ids):
+        matrix = interaction_matrix(user_ids, article_ids)
+        # user_ratings_mean은 사용자의 평균 score
+        user_ratings_mean = np.asarray(matrix.sum(axis=1)).ravel() / len(article_ids)
+    else:
+        matrix = None
+        user_ratings_mean = np.zeros(len(user_ids))
+
+    k = min(len(user_ids), len(article_ids)) - 1
+    k = min(k, MAX_FACTORS)
+    if k < 1:
+        # 유저나 게시글이 너무 적으면 평균만으로 예측합니다.
+        user_factors = np.zeros((len(user_ids), 0))
+        article_factors = np.zeros((len(article_ids), 0))
+    else:
+        # R_user_mean : 사용자-article에 대해 사용자 평균 평점을 뺀 것.
+        matrix_user_mean = user_mean_centered(matrix, user_ratings_mean)
+        u, sigma, vt = svds(matrix_user_mean, k=k)
+        user_factors = u * sigma
+        article_factors = vt.T
+    return CollaborativeModel(
+        version,
+        user_ids,
+        article_ids,
+        np.ascontiguousarray(user_factors),
+        np.ascontiguousarray(article_factors),
+        user_ratings_mean,
+    )
+
+
+def read_current_version(model_dir=None):
+    model_dir = model_dir or get_model_dir()
+    try:
+        with open(os.path.join(model_dir, CURRENT_FILE), encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def publish_model(model, model_dir=None):
+    """모델을 저장한 뒤 CURRENT를 원자적으로 교체해 새 버전을 배포합니다."""
+    model_dir = model_dir or get_model_dir()
+    model.save(model_dir)
+    tmp_path = os.path.join(model_dir, CURRENT_FILE + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(model.version)
+    os.replace(tmp_path, os.path.join(model_dir, CURRENT_FILE))
+
+    # 오래된 버전 정리
+    versions = sorted(
+        name
+        for name in os.listdir(model_dir)
+        if os.path.isdir(os.path.join(model_dir, name))
+    )
+    for name in versions[:-KEEP_VERSIONS]:
+        shutil.rmtree(os.path.join(model_dir, name), ignore_errors=True)
+    return model.version
+
+
+def build_collaborative_model():
+    """모델을 학습하고 새 버전으로 배포합니다. (스케줄러/관리 명령에서 호출)"""
+    return publish_model(train_collaborative_model())
+
+
+_model_lock = threading.Lock()
+_loaded_model = None
+
+
+def get_current_model():
+    """현재 버전의 모델을 반환합니다.
+
+    CURRENT 파일의 버전이 바뀌면 새 모델로 교체(hot swap)합니다.
+    아직 빌드된 모델이 없으면 한 번 빌드합니다.
+    """
+    global _loaded_model
+    model_dir = get_model_dir()
+    version = read_current_version(model_dir)
+    model = _loaded_model
+    if model is not None and model.version == version:
+        return model
+    with _model_lock:
+        version = read_current_version(model_dir)
+        if _loaded_model is not None and _loaded_model.version == version:
+            return _loaded_model
+        if version is None:
+            version = build_collaborative_model()
+        _loaded_model = CollaborativeModel.load(model_dir, version)
+        return _loaded_model
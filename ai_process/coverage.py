@@ -0,0 +1,94 @@
+"""냉장고 재료 충족도 랭킹
+
+"냉장고에 있는 재료로 만들 수 있는 레시피" 순서로 게시글을 고릅니다.
+게시글마다 재료 집합을 비트셋(np.packbits)으로 만들어 두고,
+유저 냉장고 비트셋과 AND 한 뒤 popcount로 가진 재료 수를 한 번에 계산합니다.
+
+비트셋은 ingredient_index의 재료 목록으로 만들며,
+ingredient_index가 바뀌면(스냅샷이 새로 만들어지면) 다음 조회 때 다시 만듭니다.
+"""
+import threading
+import numpy as np
+from .ingredient_index import ingredient_index
+
+# 0~255 각 바이트의 1비트 개수
+POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(
+    axis=1, dtype=np.uint8
+)
+
+
+class CoverageIndex:
+    """게시글 x 재료 비트셋
+
+    Attributes:
+        article_ids(ndarray) : 행 순서대로의 게시글 pk
+        vocabulary(dict) : 재료 이름 -> 비트 번호
+        bits(ndarray) : (게시글 수, ceil(재료 수 / 8)) uint8
+        counts(ndarray) : 게시글별 재료 수
+    """
+
+    def __init__(self, article_ids, vocabulary, matrix):
+        self.article_ids = article_ids
+        self.vocabulary = vocabulary
+        n_words = len(vocabulary)
+        self.bits = np.zeros((len(article_ids), (n_words + 7) // 8), dtype=np.uint8)
+        rows = np.repeat(np.arange(len(article_ids)), np.diff(matrix.indptr))
+        cols = matrix.indices
+        np.bitwise_or.at(
+            self.bits, (rows, cols >> 3), (0x80 >> (cols & 7)).astype(np.uint8)
+        )
+        self.counts = np.diff(matrix.indptr)
+
+    def fridge_bits(self, ingredient_names):
+        fridge = np.zeros(self.bits.shape[1] * 8, dtype=bool)
+        cols = [
+            self.vocabulary[name]
+            for name in ingredient_names
+            if name in self.vocabulary
+        ]
+        fridge[cols] = True
+        return np.packbits(fridge)
+
+    def rank(self, ingredient_names, k=10, exclude=None):
+        """가진 재료 비율(coverage)이 높은 순, 같으면 부족한 재료가 적은 순으로 k개
+
+        냉장고 재료가 하나도 없는 게시글은 제외합니다.
+
+        return:
+            (게시글 pk 배열, coverage 배열, 부족한 재료 수 배열)
+        """
+        have = POPCOUNT[self.bits & self.fridge_bits(ingredient_names)].sum(
+            axis=1, dtype=np.int64
+        )
+        candidates = have > 0
+        if exclude is not None:
+            exclude = np.fromiter(exclude, dtype=self.article_ids.dtype)
+            if len(exclude):
+                candidates &= ~np.isin(self.article_ids, exclude)
+        candidates = np.flatnonzero(candidates)
+        have = have[candidates]
+        missing = self.counts[candidates] - have
+        coverage = have / self.counts[candidates]
+        order = np.lexsort((-have, missing, -coverage))[:k]
+        return (
+            self.article_ids[candidates[order]],
+            coverage[order],
+            missing[order],
+        )
+
+
+_coverage_lock = threading.Lock()
+_coverage_index = None
+_coverage_snapshot = None
+
+
+def get_coverage_index():
+    """현재 ingredient_index 스냅샷의 CoverageIndex를 반환합니다."""
+    global _coverage_index, _coverage_snapshot
+    snapshot = ingredient_index.snapshot()
+    with _coverage_lock:
+        if _coverage_snapshot is not snapshot:
+            article_ids, vocabulary, matrix, _ = snapshot
+            _coverage_index = CoverageIndex(article_ids, vocabulary, matrix)
+            _coverage_snapshot = snapshot
+        return _coverage_index
@@ -0,0 +1,225 @@
+"""재료 사물인식
+
+사진 속 재료를 찾아 LABELS의 이름으로 반환합니다.
+백엔드는 settings.DETECTION_BACKEND로 고릅니다.
+    roboflow : Roboflow에 호스팅된 cookai 모델 (RoboflowDetector)
+    local : 서버 CPU에서 ONNX 모델 실행 (local_detector.LocalDetector)
+
+Roboflow 클라이언트/프로젝트 조회는 프로세스당 한 번만 하고
+요청마다는 predict 호출만 합니다. (PredictorRegistry)
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import cv2
+import numpy as np
+from django.conf import settings
+from roboflow import Roboflow
+from .labels import LABELS
+from .detection_cache import detection_cache, image_hash
+
+# 예측 기준 (Roboflow predict의 confidence, overlap 인자, %)
+CONFIDENCE = 40
+OVERLAP = 30
+# 기본 모델
+PROJECT = "cookai"
+VERSION = "3"
+# 모델 입력 크기(긴 변, px). 업로드 이미지는 이 크기로 줄여서 보냅니다.
+INPUT_SIZE = 640
+# Roboflow API 동시 호출 수 (여러 장 사물인식)
+ROBOFLOW_THREADS = 4
+
+
+def decode_image(data, max_size=INPUT_SIZE):
+    """업로드된 이미지 bytes를 OpenCV(BGR) 배열로 디코딩합니다.
+
+    긴 변이 max_size보다 크면 메모리에서 바로 줄입니다. (모델 입력 크기)
+    """
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError("이미지를 읽을 수 없습니다.")
+    height, width = image.shape[:2]
+    scale = max_size / max(height, width)
+    if max_size and scale < 1:
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+    return image
+
+
+def load_roboflow_model(project, version):
+    rf = Roboflow(api_key=os.environ.get("RF_API_KEY"))
+    return rf.workspace().project(project).version(version).model
+
+
+class PredictorRegistry:
+    """(project, version)별 예측 모델을 프로세스 전역으로 보관합니다.
+
+    처음 요청될 때 factory로 한 번만 만들고(lazy), 이후에는 같은 객체를 재사용합니다.
+
+    Args:
+        factory(callable) : (project, version) -> predict(image, confidence, overlap)를 가진 객체
+    """
+
+    def __init__(self, factory=load_roboflow_model):
+        self.factory = factory
+        self._lock = threading.Lock()
+        self._predictors = {}
+
+    def get(self, project=PROJECT, version=VERSION):
+        key = (project, version)
+        predictor = self._predictors.get(key)
+        if predictor is not None:
+            return predictor
+        with self._lock:
+            predictor = self._predictors.get(key)
+            if predictor is None:
+                predictor = self.factory(project, version)
+                self._predictors[key] = predictor
+            return predictor
+
+    def register(self, predictor, project=PROJECT, version=VERSION):
+        """미리 만든 예측 모델을 등록합니다. (테스트용 stub 등)"""
+        with self._lock:
+            self._predictors[(project, version)] = predictor
+
+    def refresh(self, project=None, version=None):
+        """캐시된 모델을 버립니다. 인자가 없으면 전부, 있으면 해당 모델만
+
+        다음 get에서 factory로 다시 만듭니다.
+        """
+        with self._lock:
+            if project is None:
+                self._predictors.clear()
+            else:
+                self._predictors.pop((project, version or VERSION), None)
+
+
+predictors = PredictorRegistry()
+
+
+def get_model():
+    return predictors.get()
+
+
+class RoboflowDetector:
+    """Roboflow API 사물인식. 이미지마다 predict를 한 번씩, 여러 장은 동시에 호출합니다."""
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(
+            max_workers=ROBOFLOW_THREADS, thread_name_prefix="roboflow"
+        )
+
+    def detect(self, images, confidence, overlap):
+        model = get_model()
+
+        def predict(image):
+            prediction = model.predict(image, confidence=confidence, overlap=overlap)
+            return prediction.json()["predictions"]
+
+        if len(images) == 1:
+            return [predict(images[0])]
+        return list(self._executor.map(predict, images))
+
+
+def load_local_detector():
+    from .local_detector import LocalDetector
+
+    model_path = str(settings.DETECTION_MODEL_PATH)
+    # 클래스 이름 파일(<모델>.names, 한 줄에 하나)이 있으면 사용합니다.
+    names_path = os.path.splitext(model_path)[0] + ".names"
+    class_names = None
+    if os.path.exists(names_path):
+        with open(names_path, encoding="utf-8") as f:
+            class_names = [line.strip() for line in f if line.strip()]
+    return LocalDetector(model_path, class_names, INPUT_SIZE)
+
+
+DETECTOR_BACKENDS = {
+    "roboflow": RoboflowDetector,
+    "local": load_local_detector,
+}
+
+_detector_lock = threading.Lock()
+_detector = None
+
+
+def get_detector():
+    """설정된 백엔드의 detector를 반환합니다. 프로세스당 한 번만 만듭니다."""
+    global _detector
+    if _detector is None:
+        with _detector_lock:
+            if _detector is None:
+                _detector = DETECTOR_BACKENDS[settings.DETECTION_BACKEND]()
+    return _detector
+
+
+def set_detector(detector):
+    """detector를 교체합니다. None이면 다음 호출 때 설정대로 다시 만듭니다."""
+    global _detector
+    with _detector_lock:
+        _detector = detector
+
+
+def detect_ingredients_batch(images):
+    """여러 이미지(경로 또는 BGR 배열)의 예측 목록을 한 번에 구합니다."""
+    images = [
+        cv2.imread(image) if isinstance(image, str) else image for image in images
+    ]
+    return get_detector().detect(images, CONFIDENCE, OVERLAP)
+
+
+def predict_labels(images):
+    """여러 이미지의 (재료 이름, confidence) 목록을 구합니다."""
+    return [
+        [
+            (LABELS[p["class"]], p["confidence"])
+            for p in predictions
+            if p["class"] in LABELS
+        ]
+        for predictions in detect_ingredients_batch(images)
+    ]
+
+
+def detect_ingredients(image):
+    """이미지(경로 또는 BGR 배열)에서 재료 이름 목록을 찾습니다."""
+    return [name for name, _ in predict_labels([image])[0]]
+
+
+def predict_labels_cached(images):
+    """predict_labels와 같지만, 거의 같은 사진은 캐시된 결과를 사용합니다.
+
+    캐시에 없는 사진만 모아서 한 번에 사물인식합니다.
+    """
+    keys = [image_hash(image) for image in images]
+    results = [detection_cache.get(key) for key in keys]
+    missing = [index for index, labels in enumerate(results) if labels is None]
+    if missing:
+        predicted = predict_labels([images[index] for index in missing])
+        for index, labels in zip(missing, predicted):
+            detection_cache.set(keys[index], labels)
+            results[index] = labels
+    return results
+
+
+def detect_ingredients_cached(image):
+    """detect_ingredients와 같지만, 거의 같은 사진은 캐시된 결과를 반환합니다."""
+    return [name for name, _ in predict_labels_cached([image])[0]]
+
+
+def merge_labels(labels_per_image):
+    """이미지별 (재료 이름, confidence) 목록을 중복 없는 재료 목록으로 합칩니다.
+
+    return:
+        [{"name": 재료 이름, "confidences": [이미지별 최고 confidence 또는 None]}, ...]
+        처음 나온 순서대로 정렬됩니다.
+    """
+    merged = {}
+    for index, labels in enumerate(labels_per_image):
+        for name, confidence in labels:
+            confidences = merged.setdefault(name, [None] * len(labels_per_image))
+            if confidences[index] is None or confidences[index] < confidence:
+                confidences[index] = confidence
+    return [
+        {"name": name, "confidences": confidences}
+        for name, confidences in merged.items()
+    ]
@@ -0,0 +1,89 @@
+"""사물인식 결과 캐시
+
+같은 냉장고 사진을 다시 올리는 경우가 많아, 이미지의 perceptual hash(pHash)를 키로
+사물인식 결과를 프로세스 메모리에 보관합니다.
+hash의 Hamming 거리가 DETECTION_CACHE_DISTANCE 이하이면 같은 사진으로 보고
+캐시된 결과를 반환합니다. TTL이 지나거나 크기를 넘으면(LRU) 제거됩니다.
+"""
+import threading
+import time
+from collections import OrderedDict
+import cv2
+import numpy as np
+
+# 캐시 유지 시간(초)
+DETECTION_CACHE_TTL = 60 * 30
+# 최대 캐시 개수
+DETECTION_CACHE_SIZE = 2000
+# 같은 사진으로 볼 최대 Hamming 거리(64비트 중)
+DETECTION_CACHE_DISTANCE = 6
+
+
+def image_hash(image):
+    """BGR 이미지의 64비트 pHash
+
+    흑백 32x32로 줄인 뒤 DCT의 저주파 8x8 계수를 중앙값과 비교해 비트로 만듭니다.
+    """
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    small = cv2.resize(gray, (32, 32), interpolation=cv2.INTER_AREA)
+    low = cv2.dct(np.float32(small))[:8, :8].ravel()
+    # DC 성분(밝기 평균)은 중앙값 계산에서 제외합니다.
+    bits = low > np.median(low[1:])
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hamming_distances(hashes, target):
+    """uint64 hash 배열과 target 사이의 Hamming 거리 배열"""
+    xor = np.bitwise_xor(hashes, np.uint64(target))
+    return np.unpackbits(xor.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+
+
+class DetectionCache:
+    def __init__(
+        self,
+        maxsize=DETECTION_CACHE_SIZE,
+        ttl=DETECTION_CACHE_TTL,
+        max_distance=DETECTION_CACHE_DISTANCE,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_distance = max_distance
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, image_hash):
+        """가장 가까운 hash의 결과를 반환합니다. 없으면 None"""
+        with self._lock:
+            self._purge()
+            key = image_hash
+            if key not in self._entries:
+                if not self._entries or not self.max_distance:
+                    return None
+                keys = np.fromiter(self._entries, dtype=np.uint64)
+                distances = hamming_distances(keys, image_hash)
+                nearest = int(distances.argmin())
+                if distances[nearest] > self.max_distance:
+                    return None
+                key = int(keys[nearest])
+            self._entries.move_to_end(key)
+            return self._entries[key][1]
+
+    def set(self, image_hash, value):
+        with self._lock:
+            self._entries[image_hash] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(image_hash)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _purge(self):
+        now = time.monotonic()
+        expired = [key for key, entry in self._entries.items() if entry[0] < now]
+        for key in expired:
+            del self._entries[key]
+
+
+detection_cache = DetectionCache()
@@ -0,0 +1,129 @@
+"""사물인식 작업 큐
+
+업로드 요청이 추론을 기다리며 워커를 붙잡지 않도록,
+사진을 로컬 스레드 풀에 작업으로 넣고 작업 id를 바로 돌려줍니다.
+동시에 실행되는 추론은 DETECTION_WORKERS개, 대기 포함 작업은 DETECTION_MAX_PENDING개로 제한하며
+가득 차면 DetectionQueueFull을 발생시킵니다.
+
+작업 상태와 결과는 DetectionJob 모델(DB)에 저장하므로
+작업을 등록한 워커가 아닌 다른 워커에서도 조회할 수 있습니다.
+"""
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from django.db import DatabaseError, close_old_connections
+from django.utils import timezone
+from ai_process.models import DetectionJob
+
+# 동시에 실행할 추론 개수
+DETECTION_WORKERS = 2
+# 실행중 + 대기중 작업 최대 개수
+DETECTION_MAX_PENDING = 20
+# 끝난 작업 결과 보관 시간(초)
+DETECTION_JOB_TTL = 60 * 10
+# long polling시 DB를 다시 조회하는 간격(초)
+DETECTION_POLL_INTERVAL = 0.2
+# 작업 상태 저장 시도 횟수
+DETECTION_UPDATE_RETRIES = 5
+
+logger = logging.getLogger(__name__)
+
+
+class DetectionQueueFull(Exception):
+    pass
+
+
+class DetectionJobQueue:
+    def __init__(
+        self,
+        max_workers=DETECTION_WORKERS,
+        max_pending=DETECTION_MAX_PENDING,
+        ttl=DETECTION_JOB_TTL,
+        poll_interval=DETECTION_POLL_INTERVAL,
+    ):
+        self.max_workers = max_workers
+        self.ttl = ttl
+        self.poll_interval = poll_interval
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="detection"
+                )
+            return self._executor
+
+    def submit(self, user_id, func, *args):
+        """func(*args)의 반환값을 결과로 하는 작업을 넣습니다."""
+        if not self._slots.acquire(blocking=False):
+            raise DetectionQueueFull
+        try:
+            self._purge()
+            job = DetectionJob.objects.create(id=uuid.uuid4().hex, user_id=user_id)
+        except Exception:
+            self._slots.release()
+            raise
+        self._get_executor().submit(self._run, job.id, func, args)
+        return job
+
+    def get(self, job_id, user_id):
+        """유저 자신의 작업만 반환합니다. 없으면 None"""
+        return DetectionJob.objects.filter(pk=job_id, user_id=user_id).first()
+
+    def wait(self, job_id, user_id, timeout):
+        """작업이 끝나거나 timeout초가 지날 때까지 DB를 다시 조회합니다.
+
+        return:
+            마지막으로 조회한 작업, 없으면 None
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self.get(job_id, user_id)
+            remaining = deadline - time.monotonic()
+            if job is None or job.is_finished or remaining <= 0:
+                return job
+            time.sleep(min(self.poll_interval, remaining))
+
+    def _update(self, job_id, **fields):
+        """작업 행을 갱신합니다. 일시적인 DB 오류(잠금 등)는 몇 번 다시 시도합니다."""
+        for attempt in range(DETECTION_UPDATE_RETRIES):
+            try:
+                return DetectionJob.objects.filter(pk=job_id).update(**fields)
+            except DatabaseError:
+                if attempt == DETECTION_UPDATE_RETRIES - 1:
+                    logger.exception("사물인식 작업 %s 상태 저장 실패", job_id)
+                    return 0
+                time.sleep(self.poll_interval)
+
+    def _run(self, job_id, func, args):
+        try:
+            self._update(job_id, status="running")
+            try:
+                results = func(*args)
+            except Exception as e:
+                self._update(
+                    job_id,
+                    status="failed",
+                    error=str(e) or e.__class__.__name__,
+                    finished_at=timezone.now(),
+                )
+            else:
+                self._update(
+                    job_id, status="done", results=results, finished_at=timezone.now()
+                )
+        finally:
+            close_old_connections()
+            self._slots.release()
+
+    def _purge(self):
+        DetectionJob.objects.filter(
+            finished_at__lt=timezone.now() - timezone.timedelta(seconds=self.ttl)
+        ).delete()
+
+
+detection_queue = DetectionJobQueue()
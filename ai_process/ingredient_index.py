@@ -0,0 +1,156 @@
+"""게시글-재료 TF-IDF 인덱스
+
+content_base 추천이 요청마다 TfidfVectorizer를 다시 학습하지 않도록,
+게시글별 재료 빈도를 프로세스 메모리에 유지합니다.
+RecipeIngredient가 생성/수정/삭제되면 signals.py에서 해당 게시글만 갱신하고,
+희소행렬(CSR)은 변경 후 첫 조회 때 메모리 데이터로 다시 만듭니다. (DB 재조회, 재학습 없음)
+다른 프로세스(다른 워커, 스케줄러)에서 바뀐 재료는 INDEX_MAX_AGE가 지나면 DB에서 다시 만들어 반영합니다.
+
+재료 하나(Ingredient pk)를 하나의 단어로 취급하며,
+idf는 TfidfVectorizer 기본값과 같은 smooth idf, 벡터는 l2 정규화합니다.
+"""
+import threading
+import time
+from collections import Counter
+import numpy as np
+from scipy import sparse
+from articles.models import RecipeIngredient
+
+# 인덱스 최대 유지 시간(초). 지나면 다음 조회 때 DB에서 다시 만듭니다.
+INDEX_MAX_AGE = 60 * 10
+
+
+class IngredientIndex:
+    """게시글 x 재료 TF-IDF 희소 인덱스
+
+    Attributes:
+        version(int) : 인덱스가 바뀔 때마다 1씩 증가합니다.
+    """
+
+    def __init__(self, max_age=INDEX_MAX_AGE):
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self.reset()
+
+    def reset(self):
+        """인덱스를 비웁니다. 다음 조회 때 DB에서 다시 만듭니다."""
+        with self._lock:
+            self._built_at = None
+            self._rows = {}
+            self._document_frequency = Counter()
+            self._snapshot = None
+            self.version = 0
+
+    def _build(self):
+        self._rows = {}
+        self._document_frequency = Counter()
+        pairs = RecipeIngredient.objects.values_list("article_id", "ingredient_id")
+        for article_id, ingredient_id in pairs:
+            self._rows.setdefault(article_id, Counter())[ingredient_id] += 1
+        for counts in self._rows.values():
+            self._document_frequency.update(counts.keys())
+        self._built_at = time.monotonic()
+        self._snapshot = None
+        self.version += 1
+
+    def _ensure_built(self):
+        if self._built_at is None or time.monotonic() - self._built_at > self.max_age:
+            self._build()
+
+    def _set_row(self, article_id, counts):
+        old = self._rows.pop(article_id, None)
+        if old:
+            self._document_frequency.subtract(old.keys())
+        if counts:
+            self._rows[article_id] = counts
+            self._document_frequency.update(counts.keys())
+        self._document_frequency += Counter()  # 0 이하인 항목 제거
+        self._snapshot = None
+        self.version += 1
+
+    def refresh_article(self, article_id):
+        """게시글 하나의 재료 목록을 DB에서 다시 읽어 인덱스에 반영합니다."""
+        with self._lock:
+            if self._built_at is None:
+                return
+            counts = Counter(
+                RecipeIngredient.objects.filter(article_id=article_id).values_list(
+                    "ingredient_id", flat=True
+                )
+            )
+            self._set_row(article_id, counts)
+
+    def remove_article(self, article_id):
+        with self._lock:
+            if self._built_at is not None and article_id in self._rows:
+                self._set_row(article_id, None)
+
+    def current_version(self):
+        """INDEX_MAX_AGE가 지났으면 다시 만든 뒤 version을 반환합니다."""
+        with self._lock:
+            self._ensure_built()
+            return self.version
+
+    def snapshot(self):
+        """(게시글 pk 배열, 재료 -> 열 번호, l2 정규화된 TF-IDF CSR, idf 배열)"""
+        with self._lock:
+            self._ensure_built()
+            if self._snapshot is None:
+                self._snapshot = self._make_snapshot()
+            return self._snapshot
+
+    def _make_snapshot(self):
+        article_ids = np.array(sorted(self._rows), dtype=np.int64)
+        vocabulary = {
+            name: col for col, name in enumerate(sorted(self._document_frequency))
+        }
+        n_documents = len(article_ids)
+        document_frequency = np.array(
+            [self._document_frequency[name] for name in sorted(vocabulary)],
+            dtype=np.float64,
+        )
+        idf = np.log((1 + n_documents) / (1 + document_frequency)) + 1
+
+        rows, cols, data = [], [], []
+        for row, article_id in enumerate(article_ids.tolist()):
+            for name, count in self._rows[article_id].items():
+                rows.append(row)
+                cols.append(vocabulary[name])
+                data.append(count)
+        matrix = sparse.csr_matrix(
+            (
+                np.array(data, dtype=np.float64),
+                (np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64)),
+            ),
+            shape=(n_documents, len(vocabulary)),
+        )
+        if not n_documents:
+            return article_ids, vocabulary, matrix, idf
+        matrix = matrix @ sparse.diags(idf)
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        matrix = sparse.diags(1 / norms) @ matrix
+        return article_ids, vocabulary, matrix.tocsr(), idf
+
+    def similarity(self, ingredient_names):
+        """재료 목록과 각 게시글의 cosine 유사도
+
+        Returns:
+            (게시글 pk 배열, 유사도 배열)
+        """
+        article_ids, vocabulary, matrix, idf = self.snapshot()
+        query = Counter(name for name in ingredient_names if name in vocabulary)
+        if not query:
+            return article_ids, np.zeros(len(article_ids))
+        cols = np.array([vocabulary[name] for name in query])
+        values = np.array(list(query.values()), dtype=np.float64) * idf[cols]
+        values /= np.linalg.norm(values)
+        vector = sparse.csr_matrix(
+            (values, (cols, np.zeros(len(cols), dtype=np.int64))),
+            shape=(len(vocabulary), 1),
+        )
+        scores = np.asarray((matrix @ vector).todense()).ravel()
+        return article_ids, scores
+
+
+ingredient_index = IngredientIndex()
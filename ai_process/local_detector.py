@@ -0,0 +1,135 @@
+"""로컬 CPU 사물인식
+
+Roboflow에서 export한 YOLO ONNX 모델을 OpenCV DNN으로 불러와
+외부 API 호출 없이 서버 CPU에서 재료를 찾습니다.
+모델은 워커(프로세스)당 한 번만 불러오고, 여러 장은 한 번의 forward로 처리합니다.
+
+출력 형식:
+    YOLOv5 (batch, boxes, 5 + classes)  x, y, w, h, objectness, class scores
+    YOLOv8 (batch, 4 + classes, boxes)  x, y, w, h, class scores
+"""
+import threading
+import cv2
+import numpy as np
+
+
+def box_iou(box, boxes):
+    """box(x1, y1, x2, y2) 하나와 boxes 배열의 IoU"""
+    x1 = np.maximum(box[0], boxes[:, 0])
+    y1 = np.maximum(box[1], boxes[:, 1])
+    x2 = np.minimum(box[2], boxes[:, 2])
+    y2 = np.minimum(box[3], boxes[:, 3])
+    intersection = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area = (box[2] - box[0]) * (box[3] - box[1])
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    return intersection / np.maximum(area + areas - intersection, 1e-9)
+
+
+def non_max_suppression(boxes, scores, class_ids, iou_threshold):
+    """클래스별 NMS. 남길 box의 index 배열을 score 내림차순으로 반환합니다.
+
+    Args:
+        boxes(ndarray) : (n, 4) x1, y1, x2, y2
+        scores(ndarray) : (n,)
+        class_ids(ndarray) : (n,)
+        iou_threshold(float) : 이보다 많이 겹치는 같은 클래스 box는 제거
+    """
+    # 클래스마다 좌표를 멀리 떨어뜨려 한 번의 루프로 클래스별 NMS를 합니다.
+    span = boxes.max() - boxes.min() + 1 if len(boxes) else 0
+    shifted = boxes + class_ids[:, None] * span
+    order = np.argsort(-scores, kind="stable")
+    keep = []
+    while len(order):
+        best = order[0]
+        keep.append(best)
+        rest = order[1:]
+        order = rest[box_iou(shifted[best], shifted[rest]) <= iou_threshold]
+    return np.array(keep, dtype=np.int64)
+
+
+class LocalDetector:
+    """OpenCV DNN(ONNX) 사물인식
+
+    Args:
+        model_path(str) : ONNX 모델 파일
+        class_names(list) : 클래스 번호 -> 클래스 이름(LABELS의 key), 없으면 str(번호)
+        input_size(int) : 모델 입력 크기(정사각형)
+        net : 테스트용. 미리 만든 cv2.dnn.Net 대체 객체
+    """
+
+    def __init__(self, model_path=None, class_names=None, input_size=640, net=None):
+        self.net = net if net is not None else cv2.dnn.readNetFromONNX(model_path)
+        self.class_names = class_names
+        self.input_size = input_size
+        # cv2.dnn.Net은 동시에 forward할 수 없습니다.
+        self._lock = threading.Lock()
+
+    def class_name(self, class_id):
+        if self.class_names is None:
+            return str(class_id)
+        return self.class_names[class_id]
+
+    def forward(self, images):
+        blob = cv2.dnn.blobFromImages(
+            images,
+            scalefactor=1 / 255,
+            size=(self.input_size, self.input_size),
+            swapRB=True,
+            crop=False,
+        )
+        with self._lock:
+            self.net.setInput(blob)
+            return np.asarray(self.net.forward())
+
+    def decode(self, output):
+        """한 장의 출력 -> (boxes(x1, y1, x2, y2), scores, class_ids)"""
+        if output.shape[0] < output.shape[1]:
+            # YOLOv8: (4 + classes, boxes)
+            output = output.T
+            class_scores = output[:, 4:]
+        else:
+            class_scores = output[:, 5:] * output[:, 4:5]
+        class_ids = class_scores.argmax(axis=1)
+        scores = class_scores[np.arange(len(output)), class_ids]
+        center, size = output[:, 0:2], output[:, 2:4]
+        boxes = np.concatenate([center - size / 2, center + size / 2], axis=1)
+        return boxes, scores, class_ids
+
+    def detect(self, images, confidence, overlap):
+        """여러 장을 한 번에 추론합니다.
+
+        Args:
+            images(list) : BGR 이미지 배열 목록
+            confidence(int) : 최소 confidence(%)
+            overlap(int) : NMS IoU 기준(%)
+        return:
+            이미지별 예측 목록 (Roboflow predict().json()["predictions"]와 같은 형식)
+        """
+        if not images:
+            return []
+        outputs = self.forward(images)
+        results = []
+        for image, output in zip(images, outputs):
+            boxes, scores, class_ids = self.decode(output)
+            mask = scores >= confidence / 100
+            boxes, scores, class_ids = boxes[mask], scores[mask], class_ids[mask]
+            keep = non_max_suppression(boxes, scores, class_ids, overlap / 100)
+
+            # 모델 입력 크기 기준 좌표 -> 원본 이미지 좌표
+            height, width = image.shape[:2]
+            scale = np.array([width, height, width, height]) / self.input_size
+            predictions = []
+            for index in keep.tolist():
+                x1, y1, x2, y2 = (boxes[index] * scale).tolist()
+                predictions.append(
+                    {
+                        "x": (x1 + x2) / 2,
+                        "y": (y1 + y2) / 2,
+                        "width": x2 - x1,
+                        "height": y2 - y1,
+                        "confidence": float(scores[index]),
+                        "class": self.class_name(int(class_ids[index])),
+                    }
+                )
+            results.append(predictions)
+        return results
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from ai_process.collaborative import build_collaborative_model
+
+
+class Command(BaseCommand):
+    help = "협업 필터링 추천 모델을 학습하고 새 버전으로 배포합니다."
+
+    def handle(self, *args, **options):
+        version = build_collaborative_model()
+        self.stdout.write(self.style.SUCCESS(f"recommend model {version} published"))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from ai_process.trending import refresh_trending_articles
+
+
+class Command(BaseCommand):
+    help = "비로그인 유저 추천용 인기 게시글 순위를 다시 계산합니다."
+
+    def handle(self, *args, **options):
+        count = refresh_trending_articles()
+        self.stdout.write(self.style.SUCCESS(f"{count} trending articles saved"))
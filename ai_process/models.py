@@ -1,8 +1,102 @@
 from django.db import models
 from users.models import User
+from articles.models import Article
 
 
 # Create your models here.
 class ImageUpload(models.Model):
     image = models.ImageField(null=True)
     user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True)
+
+
+class TrendingArticle(models.Model):
+    """인기 게시글 모델
+
+    비로그인 유저 추천에 쓰이는 인기 게시글 순위입니다.
+    스케줄러가 주기적으로 trending.refresh_trending_articles로 다시 계산합니다.
+
+    Attributes:
+    article(OtoO) : 게시글, 역참조 : trending
+    score(Int) : 댓글 수 + 좋아요 수 * 3 + 북마크 수 * 4
+    rank(Int) : 순위, 1부터 시작
+    updated_at(Date) : 계산 시간
+    """
+
+    article = models.OneToOneField(
+        Article,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="trending",
+    )
+    score = models.IntegerField(
+        default=0,
+    )
+    rank = models.PositiveIntegerField(
+        db_index=True,
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+    )
+
+    def __str__(self):
+        return str(self.article)
+
+
+class DetectionJob(models.Model):
+    """사물인식 작업 모델
+
+    추론은 작업을 받은 프로세스의 스레드 풀에서 실행하지만, 상태와 결과는 DB에 저장해
+    다른 gunicorn 워커로 들어온 조회 요청에서도 읽을 수 있게 합니다. (detection_jobs.py)
+
+    Attributes:
+    id(Char) : 작업 id (uuid4 hex)
+    user(ForeignKey) : 요청한 유저, CASCADE
+    status(Char) : pending, running, done, failed
+    results(JSON) : 찾은 재료 이름 목록
+    error(Text) : 실패 사유
+    created_at(Date) : 등록 시간
+    finished_at(Date) : 끝난 시간, 오래된 작업 정리용 인덱스
+    """
+
+    FINISHED = ("done", "failed")
+
+    id = models.CharField(
+        max_length=32,
+        primary_key=True,
+    )
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+    )
+    status = models.CharField(
+        max_length=10,
+        default="pending",
+    )
+    results = models.JSONField(
+        null=True,
+    )
+    error = models.TextField(
+        null=True,
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+    )
+    finished_at = models.DateTimeField(
+        null=True,
+        db_index=True,
+    )
+
+    def __str__(self):
+        return f"{self.id} {self.status}"
+
+    @property
+    def is_finished(self):
+        return self.status in self.FINISHED
+
+    def to_dict(self):
+        data = {"job_id": self.id, "status": self.status}
+        if self.status == "done":
+            data["results"] = self.results
+        elif self.status == "failed":
+            data["error"] = self.error
+        return data
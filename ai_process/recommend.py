@@ -1,165 +1,82 @@
 # user - article table 만들어야하는데
 from articles.models import Article
-from users.models import User, Fridge
-import pandas as pd
-from sklearn.metrics.pairwise import cosine_similarity
-import numpy as np
-from scipy.sparse.linalg import svds
-from sklearn.feature_extraction.text import TfidfVectorizer
-
-
-def recommend_by_collabo(
-    df_svd_preds: pd.DataFrame,
-    user_id,
-    user_list,
-    ori_article_df,
-    ori_ratings_df,
-    num_recommendations=1,
-):
-    # 현재는 index로 적용이 되어있으므로 user_id - 1을 해야함.
-    user_row_number = user_list[user_id]["index"]
-
-    # 최종적으로 만든 pred_df에서 사용자 index맞는 아티클 데이터를 예상평점이 높은 순으로 정렬 됌
-    sorted_user_predictions = df_svd_preds.iloc[user_row_number].sort_values(
-        ascending=False
+from users.models import Fridge
+from .collaborative import get_current_model
+from .coverage import get_coverage_index
+from .ingredient_index import ingredient_index
+from .recommend_cache import recommend_cache
+from .utils import top_k
+
+
+def recommend_by_collabo(model, user_id, num_recommendations=10):
+    # 현재 모델에서 사용자 행의 예상 score만 계산
+    predictions = model.predict(user_id)
+    if predictions is None:
+        return [], {}
+    # 사용자가 이미 평가한 아티클과 자신이 작성한 아티클은 제외
+    exclude = set(
+        Article.like.through.objects.filter(user_id=user_id).values_list(
+            "article_id", flat=True
+        )
     )
-    # 원본 평점 데이터에서 user id에 해당하는 데이터를 뽑아낸다.
-    user_data = ori_ratings_df[ori_ratings_df["pk"] == user_id]
-    # 위에서 뽑은 user_data와 원본 영화 데이터를 합친다.
-    user_history = user_data.merge(ori_article_df, on="article").sort_values(
-        ["score"], ascending=False
+    exclude.update(
+        Article.bookmark.through.objects.filter(user_id=user_id).values_list(
+            "article_id", flat=True
+        )
     )
-    # 원본 아티클 데이터에서 사용자가 평가한 아티클 제외한 데이터를 추출
-    recommendations = ori_article_df[
-        ~ori_article_df["article"].isin(user_history["article"])
-    ]
-    recommendations = recommendations.loc[recommendations.author != user_id, :]
-    # 사용자의 영화 평점이 높은 순으로 정렬된 데이터와 위 recommendations을 합친다.
-    recommendations = recommendations.merge(
-        pd.DataFrame(sorted_user_predictions).reset_index(), on="article"
+    exclude.update(
+        Article.objects.filter(author_id=user_id).values_list("pk", flat=True)
     )
-    # 컬럼 이름 바꾸고 정렬해서 return
-    recommendations = (
-        recommendations.rename(columns={user_row_number: "Predictions"})
-        .sort_values("Predictions", ascending=False)
-        .iloc[:num_recommendations, :]
+    article_ids, scores = top_k(
+        model.article_ids, predictions, num_recommendations, exclude
     )
-    return user_history, recommendations
+    ret = {int(pk): float(score) for pk, score in zip(article_ids, scores)}
+    return list(ret.keys()), ret
 
 
 def collaborative_filtering(user_id):
-    """ """
-    users = User.objects.prefetch_related("likes").values("pk", "likes__pk")
-    user_list = User.objects.all().values("pk")
-    user_list = pd.DataFrame(list(user_list))
-    user_list.reset_index(inplace=True)
-    # Create the DataFrame
-    df = pd.DataFrame(list(users))
-    df.columns = ["pk", "article"]
-    df["score"] = 2 * df["article"] / df["article"]
-    users = User.objects.prefetch_related("bookmarks").values("pk", "bookmarks__pk")
-    users2 = User.objects.prefetch_related("bookmarks").values("pk", "bookmarks__pk")
-    df2 = pd.DataFrame(list(users2))
-    df2.columns = ["pk", "article"]
-    df2["score"] = 4 * df2["article"] / df2["article"]
-    df = pd.concat([df, df2], ignore_index=True)
-    df = df.merge(right=user_list, on="pk")
-    articles = Article.objects.all().values("pk", "author")
-    df3 = pd.DataFrame(list(articles))
-    df3.columns = ["article", "author"]
-    df = df.merge(right=df3, how="outer", on="article")
-    unique_index = df["index"].dropna().unique()
-    pvt = df.pivot_table(
-        values="score",
-        index=["index"],
-        columns=["article"],
-        dropna=False,
-        fill_value=0,
-        aggfunc=np.sum,
-    )
-    pvt = pvt.reindex(unique_index, fill_value=0).sort_index()
-    matrix = pvt.values
-
-    # user_ratings_mean은 사용자의 평균 score
-    user_ratings_mean = np.mean(matrix, axis=1)
-
-    # R_user_mean : 사용자-article에 대해 사용자 평균 평점을 뺀 것.
-    matrix_user_mean = matrix - user_ratings_mean.reshape(-1, 1)
-    k = min(matrix_user_mean.shape) - 1
-    k = min(k, 12)
-    u, sigma, vt = svds(matrix_user_mean, k=k)
-    sigma = np.diag(sigma)
-    svd_user_predicted_ratings = np.dot(
-        np.dot(u, sigma), vt
-    ) + user_ratings_mean.reshape(-1, 1)
-    df_svd_preds = pd.DataFrame(svd_user_predicted_ratings, columns=pvt.columns)
-    df = df.groupby(["index", "article"]).sum()
-    df = df.reset_index()
-    # user_list={}
-    user_list = user_list.set_index("pk").T.to_dict()
-    already_rated, predictions = recommend_by_collabo(
-        df_svd_preds, user_id, user_list, df3, df, 10
-    )
-    ret = {
-        pk: score
-        for pk, score in zip(predictions["article"], predictions["Predictions"])
-    }
-    return list(predictions["article"]), ret
-
-
-def queryset_to_str(query):
-    try:
-        list_ = [str(q) for q in list(query)]
-        return " ".join(list_)
-    except:
-        return str(query)
-
-
-def recommend_by_ingredient(matrix, items, k=10):
-    recom_idx = (
-        matrix.loc[:, 0].values.reshape(1, -1).argsort()[:, ::-1].flatten()[1 : k + 1]
-    )
-    recom_article = items.iloc[recom_idx, :].pk.values
-    scores = []
-    scores = [matrix.loc[i, 0] for i in recom_article]
-    d = {
-        "pk": recom_article,
-        "score": scores,
-    }
-    return pd.DataFrame(d)
+    # 학습은 collaborative.build_collaborative_model에서 오프라인으로 진행
+    model = get_current_model()
+    return recommend_by_collabo(model, user_id, 10)
 
 
 def content_base(user_id):
-    articles = Article.objects.exclude(author_id=user_id).values(
-        "pk", "recipeingredient__ingredient"
+    # 재료 TF-IDF 인덱스는 ingredient_index에서 미리 만들어 둠
+    fridge = Fridge.objects.filter(user_id=user_id).values_list(
+        "ingredient_id", flat=True
     )
-
-    df = (
-        pd.DataFrame(list(articles))
-        .groupby("pk")
-        .aggregate({"recipeingredient__ingredient": queryset_to_str})
-        .reset_index()
-    )
-    df.columns = ["pk", "ingredient"]
-    fridge = Fridge.objects.filter(user_id=user_id).values("ingredient")
-
-    df.loc[len(df.index)] = [0, queryset_to_str(fridge)]
-    tfidf_vector = TfidfVectorizer()
-    tfidf_matrix = tfidf_vector.fit_transform(df["ingredient"]).toarray()
-    tfidf_matrix_feature = tfidf_vector.get_feature_names_out()
-    tfidf_matrix = (
-        pd.DataFrame(
-            tfidf_matrix, columns=tfidf_matrix_feature, index=df["pk"]
-        ).sort_index()
-        # .reset_index()
+    article_ids, scores = ingredient_index.similarity(list(fridge))
+    # 자신이 작성한 아티클은 제외
+    own = Article.objects.filter(author_id=user_id).values_list("pk", flat=True)
+    article_ids, scores = top_k(article_ids, scores, 10, own)
+    dict_ = {int(pk): float(score) for pk, score in zip(article_ids, scores)}
+    return list(dict_.keys()), dict_
+
+
+def fridge_coverage(user_id):
+    # 냉장고 재료로 만들 수 있는 비율이 높고, 부족한 재료가 적은 순
+    fridge = Fridge.objects.filter(user_id=user_id).values_list(
+        "ingredient_id", flat=True
     )
-    my_vector = list(tfidf_matrix.loc[0, :])
-    list_ = []
-    dict_ = {}
-
-    cosine_sim = cosine_similarity(tfidf_matrix, [my_vector])
-    dict_ = {
-        key: value[0] for value, key in zip(cosine_sim[1:], tfidf_matrix.index[1:])
-    }
-    dict_ = dict(sorted(dict_.items(), key=lambda x: x[1], reverse=True))
-    return [k for k in dict_.keys()][:10], dict_
+    own = Article.objects.filter(author_id=user_id).values_list("pk", flat=True)
+    article_ids, coverage, _ = get_coverage_index().rank(list(fridge), 10, own)
+    dict_ = {int(pk): float(score) for pk, score in zip(article_ids, coverage)}
+    return [int(pk) for pk in article_ids], dict_
+
+
+RECOMMENDERS = {
+    "0": (collaborative_filtering, lambda: get_current_model().version),
+    "1": (content_base, ingredient_index.current_version),
+    "2": (fridge_coverage, ingredient_index.current_version),
+}
+
+
+def get_recommendations(user_id, algorithm):
+    """캐시된 추천 결과를 반환하고, 없으면 계산해서 캐시합니다."""
+    recommender, get_version = RECOMMENDERS[algorithm]
+    version = get_version()
+    result = recommend_cache.get(user_id, algorithm, version)
+    if result is None:
+        result = recommender(user_id)
+        recommend_cache.set(user_id, algorithm, version, result)
+    return result
@@ -0,0 +1,66 @@
+"""유저별 추천 결과 캐시
+
+(유저, 알고리즘, 모델 버전)을 키로 추천 결과를 프로세스 메모리에 보관합니다.
+TTL이 지나거나 크기를 넘으면(LRU) 제거되고,
+좋아요/북마크/냉장고가 바뀌면 signals.py에서 해당 유저의 결과를 지웁니다.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+# 캐시 유지 시간(초)
+RECOMMEND_CACHE_TTL = 60 * 10
+# 최대 캐시 개수
+RECOMMEND_CACHE_SIZE = 10000
+
+
+class RecommendCache:
+    def __init__(self, maxsize=RECOMMEND_CACHE_SIZE, ttl=RECOMMEND_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._user_keys = {}
+
+    def get(self, user_id, algorithm, version):
+        key = (user_id, algorithm, version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, user_id, algorithm, version, value):
+        key = (user_id, algorithm, version)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            self._user_keys.setdefault(user_id, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id):
+        with self._lock:
+            for key in list(self._user_keys.get(user_id, ())):
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._user_keys.clear()
+
+    def _remove(self, key):
+        self._entries.pop(key, None)
+        keys = self._user_keys.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._user_keys[key[0]]
+
+
+recommend_cache = RecommendCache()
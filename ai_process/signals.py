@@ -0,0 +1,42 @@
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from articles.models import Article, RecipeIngredient
+from users.models import Fridge
+from .ingredient_index import ingredient_index
+from .recommend_cache import recommend_cache
+
+
+@receiver(post_save, sender=RecipeIngredient)
+@receiver(post_delete, sender=RecipeIngredient)
+def update_ingredient_index(sender, instance, **kwargs):
+    """레시피 재료가 바뀐 게시글만 재료 인덱스에 다시 반영합니다."""
+    ingredient_index.refresh_article(instance.article_id)
+
+
+@receiver(post_delete, sender=Article)
+def remove_from_ingredient_index(sender, instance, **kwargs):
+    ingredient_index.remove_article(instance.pk)
+
+
+@receiver(m2m_changed, sender=Article.like.through)
+@receiver(m2m_changed, sender=Article.bookmark.through)
+def invalidate_recommend_cache_on_rating(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """좋아요/북마크가 바뀐 유저의 추천 캐시를 지웁니다."""
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:
+        recommend_cache.invalidate_user(instance.pk)
+    elif pk_set is None:
+        # article.like.clear()는 어떤 유저인지 알 수 없으므로 전부 지웁니다.
+        recommend_cache.clear()
+    else:
+        for user_id in pk_set:
+            recommend_cache.invalidate_user(user_id)
+
+
+@receiver(post_save, sender=Fridge)
+@receiver(post_delete, sender=Fridge)
+def invalidate_recommend_cache_on_fridge(sender, instance, **kwargs):
+    recommend_cache.invalidate_user(instance.user_id)
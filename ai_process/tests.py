@@ -28,3 +28,666 @@
 #         self.assertEqual(response.status_code, 201)
 #         self.assertIn("result", response.data)
 #         self.assertTrue(ImageUpload.objects.filter(image="images/test_image.jpg").exists())
+
+
+import tempfile
+import threading
+import time
+from io import StringIO
+from unittest import mock
+import cv2
+import numpy as np
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase, APITransactionTestCase
+from articles.models import (
+    Article,
+    Category,
+    Comment,
+    Ingredient,
+    RecipeIngredient,
+)
+from users.models import User, Fridge
+from ai_process import collaborative
+from ai_process.ingredient_index import ingredient_index
+from ai_process.recommend import (
+    collaborative_filtering,
+    content_base,
+    fridge_coverage,
+    get_recommendations,
+)
+from ai_process.coverage import get_coverage_index
+from ai_process.recommend_cache import RecommendCache, recommend_cache
+from ai_process.models import TrendingArticle
+from ai_process.trending import (
+    TrendingRefresher,
+    refresh_trending_articles,
+    trending_refresher,
+)
+from articles.counters import reconcile_counters
+from ai_process.utils import top_k
+from ai_process.detection import (
+    PredictorRegistry,
+    decode_image,
+    detect_ingredients,
+    detect_ingredients_cached,
+    merge_labels,
+    predictors,
+)
+from ai_process.local_detector import LocalDetector, non_max_suppression
+from ai_process.detection_cache import DetectionCache, detection_cache, image_hash
+from ai_process.detection_jobs import DetectionJobQueue, DetectionQueueFull
+
+
+class TopKTestCase(TestCase):
+    def test_top_k(self):
+        """정상: 제외 목록을 뺀 상위 k개를 점수 내림차순으로 반환"""
+        ids = list(range(100, 120))
+        scores = [(i * 7) % 20 for i in range(20)]
+        top_ids, top_scores = top_k(ids, scores, 3, exclude=[ids[17]])
+        self.assertEqual(list(top_scores), [18, 17, 16])
+        self.assertNotIn(ids[17], top_ids)
+        self.assertEqual(len(top_k(ids, scores, 50)[0]), 20)
+        self.assertEqual(len(top_k([], [], 10)[0]), 0)
+
+
+class RecommendBaseTestCase(TestCase):
+    """추천 테스트 준비
+
+    유저 4명, 게시글 6개, 좋아요/북마크 데이터를 추가합니다.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [
+            User.objects.create_user(
+                username=f"testuser{i}",
+                email=f"testuser{i}@gmail.com",
+                password="xptmxm111!",
+            )
+            for i in range(4)
+        ]
+        category = Category.objects.create(name="한식", info="한식")
+        cls.articles = [
+            Article.objects.create(
+                author=cls.users[i % 2], category=category, title=f"title{i}"
+            )
+            for i in range(6)
+        ]
+        cls.articles[0].like.add(cls.users[2], cls.users[3])
+        cls.articles[1].like.add(cls.users[2])
+        cls.articles[2].bookmark.add(cls.users[3])
+        cls.articles[3].like.add(cls.users[3])
+
+
+class CollaborativeModelTestCase(RecommendBaseTestCase):
+    def setUp(self):
+        self.model_dir = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(
+            RECOMMEND_MODEL_DIR=self.model_dir.name
+        )
+        self.settings_override.enable()
+        collaborative._loaded_model = None
+
+    def tearDown(self):
+        self.settings_override.disable()
+        self.model_dir.cleanup()
+        collaborative._loaded_model = None
+
+    def test_build_and_hot_swap(self):
+        """정상: 모델 빌드 후 새 버전이 배포되면 교체"""
+        first = collaborative.build_collaborative_model()
+        self.assertEqual(collaborative.get_current_model().version, first)
+        second = collaborative.build_collaborative_model()
+        self.assertNotEqual(first, second)
+        self.assertEqual(collaborative.get_current_model().version, second)
+
+    def test_recommend_excludes_rated_and_own(self):
+        """정상: 이미 평가한 글과 자신의 글은 추천에서 제외"""
+        user = self.users[2]
+        list_of_pk, scores = collaborative_filtering(user.id)
+        rated = {self.articles[0].pk, self.articles[1].pk}
+        own = set(Article.objects.filter(author=user).values_list("pk", flat=True))
+        self.assertTrue(list_of_pk)
+        self.assertFalse(set(list_of_pk) & (rated | own))
+        self.assertEqual(list_of_pk, sorted(scores, key=scores.get, reverse=True))
+
+    def test_unknown_user(self):
+        """예외: 모델 빌드 이후 가입한 유저는 빈 추천"""
+        collaborative.build_collaborative_model()
+        new_user = User.objects.create_user(
+            username="newuser", email="newuser@gmail.com", password="xptmxm111!"
+        )
+        self.assertEqual(collaborative_filtering(new_user.id), ([], {}))
+
+    def test_sparse_interaction_matrix(self):
+        """정상: 희소행렬과 평균 보정 LinearOperator가 밀집 계산과 일치"""
+        user_ids = np.array(sorted(u.pk for u in self.users))
+        article_ids = np.array(sorted(a.pk for a in self.articles))
+        matrix = collaborative.interaction_matrix(user_ids, article_ids)
+        dense = matrix.toarray()
+        self.assertEqual(dense.sum(), 2 * 4 + 4 * 1)
+        means = dense.mean(axis=1)
+        centered = collaborative.user_mean_centered(matrix, means)
+        x = np.arange(len(article_ids), dtype=float)
+        y = np.arange(len(user_ids), dtype=float)
+        np.testing.assert_allclose(centered.matvec(x), (dense - means[:, None]) @ x)
+        np.testing.assert_allclose(centered.rmatvec(y), (dense - means[:, None]).T @ y)
+
+
+class IngredientBaseTestCase(RecommendBaseTestCase):
+    """재료 추천 테스트 준비
+
+    게시글 0~3에 레시피 재료를, users[1]의 냉장고에 양파/감자를 추가합니다.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for name in ("양파", "감자", "당근", "돼지고기"):
+            Ingredient.objects.create(ingredient_name=name)
+        recipes = {
+            0: ("양파", "감자"),
+            1: ("양파", "감자", "당근"),
+            2: ("돼지고기",),
+            3: ("양파", "돼지고기"),
+        }
+        for i, names in recipes.items():
+            for name in names:
+                RecipeIngredient.objects.create(
+                    article=cls.articles[i],
+                    ingredient_id=name,
+                    ingredient_quantity=1,
+                    ingredient_unit="개",
+                )
+        for name in ("양파", "감자"):
+            Fridge.objects.create(user=cls.users[1], ingredient_id=name)
+
+    def setUp(self):
+        ingredient_index.reset()
+
+
+class ContentBaseTestCase(IngredientBaseTestCase):
+    def test_content_base(self):
+        """정상: 냉장고 재료와 유사한 순서로 추천, 자신의 글은 제외"""
+        list_of_pk, scores = content_base(self.users[1].id)
+        # users[1]은 홀수번째 게시글의 작성자
+        self.assertEqual(list_of_pk[:2], [self.articles[0].pk, self.articles[2].pk])
+        self.assertAlmostEqual(scores[self.articles[0].pk], 1.0)
+        self.assertEqual(scores[self.articles[2].pk], 0.0)
+
+    def test_incremental_update(self):
+        """정상: 레시피 재료 변경이 인덱스에 바로 반영"""
+        content_base(self.users[1].id)
+        version = ingredient_index.version
+        RecipeIngredient.objects.create(
+            article=self.articles[2],
+            ingredient_id="양파",
+            ingredient_quantity=1,
+            ingredient_unit="개",
+        )
+        self.assertEqual(ingredient_index.version, version + 1)
+        list_of_pk, scores = content_base(self.users[1].id)
+        self.assertGreater(scores[self.articles[2].pk], 0)
+        RecipeIngredient.objects.filter(article=self.articles[0]).delete()
+        list_of_pk, scores = content_base(self.users[1].id)
+        self.assertNotIn(self.articles[0].pk, list_of_pk)
+
+
+class CoverageTestCase(IngredientBaseTestCase):
+    def test_rank(self):
+        """정상: 재료 충족 비율 높은 순, 같으면 부족한 재료가 적은 순"""
+        article_ids, coverage, missing = get_coverage_index().rank(["양파", "감자", "없음"])
+        self.assertEqual(
+            article_ids.tolist(),
+            [self.articles[0].pk, self.articles[1].pk, self.articles[3].pk],
+        )
+        self.assertEqual(coverage.tolist(), [1.0, 2 / 3, 0.5])
+        self.assertEqual(missing.tolist(), [0, 1, 1])
+
+    def test_fridge_coverage(self):
+        """정상: 유저 냉장고 기준 추천, 자신의 글은 제외, 레시피 변경 반영"""
+        list_of_pk, scores = fridge_coverage(self.users[1].id)
+        self.assertEqual(list_of_pk, [self.articles[0].pk])
+        RecipeIngredient.objects.create(
+            article=self.articles[4],
+            ingredient_id="감자",
+            ingredient_quantity=1,
+            ingredient_unit="개",
+        )
+        list_of_pk, scores = fridge_coverage(self.users[1].id)
+        self.assertEqual(list_of_pk, [self.articles[0].pk, self.articles[4].pk])
+        self.assertEqual(scores[self.articles[4].pk], 1.0)
+
+    def test_rebuild_after_max_age(self):
+        """정상: 다른 프로세스의 변경(signal 없음)도 INDEX_MAX_AGE가 지나면 반영"""
+        fridge_coverage(self.users[1].id)
+        version = ingredient_index.current_version()
+        # bulk_create는 signal을 보내지 않습니다.
+        RecipeIngredient.objects.bulk_create(
+            [
+                RecipeIngredient(
+                    article=self.articles[4],
+                    ingredient_id="감자",
+                    ingredient_quantity=1,
+                    ingredient_unit="개",
+                )
+            ]
+        )
+        list_of_pk, _ = fridge_coverage(self.users[1].id)
+        self.assertEqual(list_of_pk, [self.articles[0].pk])
+        with mock.patch.object(ingredient_index, "max_age", 0):
+            self.assertGreater(ingredient_index.current_version(), version)
+            list_of_pk, _ = fridge_coverage(self.users[1].id)
+        self.assertEqual(list_of_pk, [self.articles[0].pk, self.articles[4].pk])
+
+
+class RecommendCacheTestCase(IngredientBaseTestCase):
+    def setUp(self):
+        super().setUp()
+        recommend_cache.clear()
+
+    def test_lru_and_ttl(self):
+        """정상: 크기를 넘으면 오래된 것부터, TTL이 지나면 제거"""
+        cache = RecommendCache(maxsize=2, ttl=60)
+        cache.set(1, "1", 0, "a")
+        cache.set(2, "1", 0, "b")
+        cache.get(1, "1", 0)
+        cache.set(3, "1", 0, "c")
+        self.assertEqual(cache.get(1, "1", 0), "a")
+        self.assertIsNone(cache.get(2, "1", 0))
+        cache.ttl = -1
+        cache.set(4, "1", 0, "d")
+        self.assertIsNone(cache.get(4, "1", 0))
+
+    def test_cached_until_fridge_changes(self):
+        """정상: 두번째 요청은 메모리에서, 냉장고가 바뀌면 다시 계산"""
+        user = self.users[1]
+        first = get_recommendations(user.id, "1")
+        with self.assertNumQueries(0):
+            self.assertEqual(get_recommendations(user.id, "1"), first)
+        Fridge.objects.create(user=user, ingredient_id="돼지고기")
+        list_of_pk, scores = get_recommendations(user.id, "1")
+        self.assertGreater(scores[self.articles[2].pk], 0)
+
+    def test_invalidated_by_like(self):
+        """정상: 좋아요를 누르면 해당 유저의 캐시 제거"""
+        user = self.users[1]
+        get_recommendations(user.id, "1")
+        self.articles[0].like.add(user)
+        self.assertIsNone(recommend_cache.get(user.id, "1", ingredient_index.version))
+
+
+class TrendingTestCase(RecommendBaseTestCase):
+    def test_refresh_trending(self):
+        """정상: 댓글 + 좋아요*3 + 북마크*4 순으로 저장"""
+        for _ in range(2):
+            Comment.objects.create(
+                author=self.users[0], article=self.articles[1], comment="맛있어요"
+            )
+        reconcile_counters()
+        refresh_trending_articles()
+        ranking = list(
+            TrendingArticle.objects.order_by("rank").values_list("article_id", "score")
+        )
+        self.assertEqual(
+            ranking,
+            [
+                (self.articles[0].pk, 6),
+                (self.articles[1].pk, 5),
+                (self.articles[2].pk, 4),
+                (self.articles[3].pk, 3),
+            ],
+        )
+
+    def test_anonymous_recommend(self):
+        """정상: 비로그인 유저는 미리 계산된 인기 게시글을 받음"""
+        reconcile_counters()
+        refresh_trending_articles()
+        response = self.client.get("/ai_process/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [article["id"] for article in response.data][:2],
+            [self.articles[0].pk, self.articles[2].pk],
+        )
+
+    def test_anonymous_recommend_before_refresh(self):
+        """정상: 순위가 없으면 요청 중에 계산/저장하지 않고 최신 게시글 반환"""
+        with mock.patch.object(trending_refresher, "request") as request_refresh:
+            response = self.client.get("/ai_process/")
+        request_refresh.assert_called_once_with()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [article["id"] for article in response.data][:2],
+            [self.articles[-1].pk, self.articles[-2].pk],
+        )
+        self.assertFalse(TrendingArticle.objects.exists())
+
+    def test_background_refresh_once(self):
+        """정상: 백그라운드 계산은 실행중이거나 retry_after 안에는 다시 시작하지 않음"""
+        started, release = threading.Event(), threading.Event()
+
+        def refresh():
+            started.set()
+            release.wait(5)
+
+        refresher = TrendingRefresher(refresh=refresh, retry_after=60)
+        self.assertTrue(refresher.request())
+        self.assertTrue(started.wait(5))
+        self.assertFalse(refresher.request())
+        release.set()
+        refresher.retry_after = 0
+        for _ in range(50):
+            if refresher.request():
+                break
+            time.sleep(0.05)
+        else:
+            self.fail("refresh did not restart")
+
+    def test_refresh_command(self):
+        """정상: 관리 명령으로 순위 계산"""
+        reconcile_counters()
+        out = StringIO()
+        call_command("refresh_trending", stdout=out)
+        self.assertIn("4 trending articles saved", out.getvalue())
+        self.assertEqual(TrendingArticle.objects.count(), 4)
+
+    def test_refresh_again(self):
+        """정상: 다시 계산하면 순위를 덮어쓰고 빠진 게시글은 삭제"""
+        reconcile_counters()
+        refresh_trending_articles()
+        self.articles[0].like.clear()
+        self.articles[0].bookmark.clear()
+        reconcile_counters()
+        refresh_trending_articles()
+        self.assertEqual(
+            list(
+                TrendingArticle.objects.order_by("rank").values_list("rank", flat=True)
+            ),
+            list(range(1, TrendingArticle.objects.count() + 1)),
+        )
+        self.assertFalse(
+            TrendingArticle.objects.filter(article=self.articles[0]).exists()
+        )
+
+
+def fake_labels(*names):
+    """predict_labels 대체. 모든 사진에서 names를 confidence 0.9로 찾음"""
+    return lambda images: [[(name, 0.9) for name in names] for _ in images]
+
+
+def make_image_file(name="fridge.png", color=(0, 128, 255), size=(64, 48)):
+    image = np.zeros((size[1], size[0], 3), dtype=np.uint8)
+    image[:] = color
+    _, buffer = cv2.imencode(".png", image)
+    return SimpleUploadedFile(name, buffer.tobytes(), content_type="image/png")
+
+
+class DetectionJobTestCase(APITransactionTestCase):
+    """작업은 다른 스레드(DB 연결)에서 실행되므로 트랜잭션으로 감싸지 않습니다."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", email="testuser@gmail.com", password="xptmxm111!"
+        )
+        detection_cache.clear()
+
+    def test_queue_backpressure(self):
+        """예외: 대기 작업이 가득 차면 DetectionQueueFull"""
+        queue = DetectionJobQueue(max_workers=1, max_pending=1)
+        release = threading.Event()
+        job = queue.submit(self.user.id, release.wait, 5)
+        with self.assertRaises(DetectionQueueFull):
+            queue.submit(self.user.id, release.wait, 5)
+        release.set()
+        self.assertEqual(queue.wait(job.id, self.user.id, 5).status, "done")
+        self.assertIsNone(queue.get(job.id, self.user.id + 1))
+
+    def test_state_shared_through_db(self):
+        """정상: 작업을 등록하지 않은 큐(다른 워커)에서도 상태와 결과 조회"""
+        queue = DetectionJobQueue(max_workers=1, poll_interval=0.01)
+        job = queue.submit(self.user.id, lambda: ["양파"])
+        other_worker = DetectionJobQueue()
+        self.assertEqual(
+            other_worker.wait(job.id, self.user.id, 5).to_dict(),
+            {"job_id": job.id, "status": "done", "results": ["양파"]},
+        )
+        self.assertIsNone(other_worker.wait("missing", self.user.id, 0.1))
+
+    @mock.patch("ai_process.detection.predict_labels", side_effect=fake_labels("양파"))
+    def test_job_upload_and_poll(self, detect):
+        """정상: 작업 등록 후 long polling으로 결과 조회"""
+        self.client.force_authenticate(self.user)
+        response = self.client.post(
+            "/ai_process/upload/jobs/", {"image": make_image_file()}, format="multipart"
+        )
+        self.assertEqual(response.status_code, 202)
+        job_id = response.data["job_id"]
+        response = self.client.get(f"/ai_process/upload/jobs/{job_id}/?wait=5")
+        self.assertEqual(
+            response.data, {"job_id": job_id, "status": "done", "results": ["양파"]}
+        )
+        self.assertEqual(detect.call_args[0][0][0].shape, (48, 64, 3))
+
+
+class StubPredictor:
+    """네트워크 없이 고정된 결과를 돌려주는 예측 모델"""
+
+    def __init__(self, classes):
+        self.classes = classes
+
+    def predict(self, image, confidence=None, overlap=None):
+        return mock.Mock(
+            json=lambda: {
+                "predictions": [{"class": c, "confidence": 0.9} for c in self.classes]
+            }
+        )
+
+
+class PredictorRegistryTestCase(TestCase):
+    def test_lazy_single_creation(self):
+        """정상: 동시에 요청해도 (project, version)당 한 번만 생성"""
+        factory = mock.Mock(side_effect=lambda p, v: StubPredictor([]))
+        registry = PredictorRegistry(factory)
+        threads = [threading.Thread(target=registry.get) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        registry.get("cookai", "4")
+        self.assertEqual(factory.call_count, 2)
+
+        registry.refresh("cookai", "4")
+        registry.get("cookai", "4")
+        registry.get()
+        self.assertEqual(factory.call_count, 3)
+
+    def test_detect_with_stub(self):
+        """정상: 등록된 stub 모델로 재료 이름 반환"""
+        predictors.register(StubPredictor(["9", "16"]))
+        self.addCleanup(predictors.refresh)
+        self.assertEqual(detect_ingredients(np.zeros((8, 8, 3))), ["감자", "계란"])
+
+
+class FakeNet:
+    """cv2.dnn.Net 대체. 입력 batch 크기만큼 같은 출력을 반환"""
+
+    def __init__(self, output):
+        self.output = output
+
+    def setInput(self, blob):
+        self.batch = blob.shape[0]
+
+    def forward(self):
+        return np.repeat(self.output[None], self.batch, axis=0)
+
+
+class LocalDetectorTestCase(TestCase):
+    def test_non_max_suppression(self):
+        """정상: 같은 클래스의 겹치는 box만 제거"""
+        boxes = np.array(
+            [[0, 0, 10, 10], [1, 1, 11, 11], [0, 0, 10, 10], [50, 50, 60, 60]],
+            dtype=np.float64,
+        )
+        scores = np.array([0.9, 0.8, 0.7, 0.6])
+        class_ids = np.array([0, 0, 1, 0])
+        keep = non_max_suppression(boxes, scores, class_ids, 0.3)
+        self.assertEqual(keep.tolist(), [0, 2, 3])
+
+    def test_batched_detect(self):
+        """정상: YOLOv8 출력을 confidence/NMS 후 원본 좌표로 변환"""
+        # (4 + 클래스 2개, box 3개): 두 box는 겹치는 클래스 1, 하나는 낮은 score
+        output = np.array(
+            [
+                [320, 324, 100],
+                [320, 324, 100],
+                [64, 64, 20],
+                [64, 64, 20],
+                [0.1, 0.0, 0.3],
+                [0.9, 0.5, 0.0],
+            ]
+        )
+        # 실제 모델처럼 box 수가 행 수보다 많도록 빈 box를 붙입니다.
+        output = np.hstack([output, np.zeros((6, 7))])
+        detector = LocalDetector(class_names=["9", "16"], net=FakeNet(output))
+        images = [np.zeros((320, 320, 3), np.uint8), np.zeros((64, 128, 3), np.uint8)]
+        results = detector.detect(images, confidence=40, overlap=30)
+        self.assertEqual(len(results), 2)
+        self.assertEqual([p["class"] for p in results[0]], ["16"])
+        self.assertEqual(results[0][0]["x"], 160)
+        self.assertEqual(results[0][0]["width"], 32)
+        self.assertAlmostEqual(results[1][0]["height"], 6.4)
+
+
+class ImageUploadTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="testuser", email="testuser@gmail.com", password="xptmxm111!"
+        )
+
+    def setUp(self):
+        detection_cache.clear()
+
+    def test_decode_downsizes(self):
+        """정상: 긴 변을 모델 입력 크기로 축소, 작은 이미지는 그대로"""
+        data = make_image_file(size=(1280, 960)).read()
+        self.assertEqual(decode_image(data).shape, (480, 640, 3))
+        self.assertEqual(decode_image(data, max_size=2000).shape, (960, 1280, 3))
+        with self.assertRaises(ValueError):
+            decode_image(b"not an image")
+
+    @mock.patch("ai_process.detection.predict_labels", side_effect=fake_labels("감자"))
+    def test_upload_in_memory(self, detect):
+        """정상: DB/파일 저장 없이 사물인식"""
+        self.client.force_authenticate(self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                "/ai_process/upload/",
+                {"image": make_image_file(size=(1280, 960))},
+                format="multipart",
+            )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data, {"results": ["감자"]})
+        self.assertEqual(detect.call_args[0][0][0].shape, (480, 640, 3))
+        self.assertFalse([q for q in queries if "ai_process_imageupload" in q["sql"]])
+
+
+class DetectionCacheTestCase(TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.image = cv2.GaussianBlur(
+            rng.integers(0, 256, (240, 320, 3), dtype=np.uint8), (9, 9), 0
+        )
+        self.other = cv2.GaussianBlur(
+            rng.integers(0, 256, (240, 320, 3), dtype=np.uint8), (9, 9), 0
+        )
+
+    def test_near_duplicate_lookup(self):
+        """정상: 밝기/크기만 다른 사진은 같은 결과, 다른 사진은 None"""
+        cache = DetectionCache()
+        cache.set(image_hash(self.image), ["감자"])
+        similar = cv2.resize(cv2.add(self.image, 10), (160, 120))
+        self.assertEqual(cache.get(image_hash(similar)), ["감자"])
+        self.assertIsNone(cache.get(image_hash(self.other)))
+
+    def test_lru_and_ttl(self):
+        """정상: 크기를 넘으면 오래 안 쓴 항목, TTL이 지나면 만료"""
+        cache = DetectionCache(maxsize=2, max_distance=0)
+        cache.set(1, ["a"])
+        cache.set(2, ["b"])
+        cache.get(1)
+        cache.set(3, ["c"])
+        self.assertIsNone(cache.get(2))
+        self.assertEqual(cache.get(1), ["a"])
+
+        cache.ttl = -1
+        cache.set(4, ["d"])
+        self.assertIsNone(cache.get(4))
+
+    @mock.patch("ai_process.detection.predict_labels", side_effect=fake_labels("양파"))
+    def test_detect_once(self, detect):
+        """정상: 같은 사진은 한 번만 사물인식"""
+        detection_cache.clear()
+        self.addCleanup(detection_cache.clear)
+        self.assertEqual(detect_ingredients_cached(self.image), ["양파"])
+        self.assertEqual(detect_ingredients_cached(self.image.copy()), ["양파"])
+        self.assertEqual(detect.call_count, 1)
+
+
+class ImageBatchUploadTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="testuser", email="testuser@gmail.com", password="xptmxm111!"
+        )
+
+    def setUp(self):
+        detection_cache.clear()
+
+    def test_merge_labels(self):
+        """정상: 재료별 중복 제거, 사진별 최고 confidence"""
+        merged = merge_labels(
+            [[("감자", 0.5), ("양파", 0.8), ("감자", 0.7)], [], [("감자", 0.6)]]
+        )
+        self.assertEqual(
+            merged,
+            [
+                {"name": "감자", "confidences": [0.7, None, 0.6]},
+                {"name": "양파", "confidences": [0.8, None, None]},
+            ],
+        )
+
+    def test_batch_upload(self):
+        """정상: 여러 장을 한 번에 사물인식하고 합친 결과 반환"""
+        self.client.force_authenticate(self.user)
+        labels = [[("감자", 0.9)], [("감자", 0.8), ("양파", 0.6)]]
+        with mock.patch(
+            "ai_process.detection.predict_labels", return_value=labels
+        ) as detect:
+            response = self.client.post(
+                "/ai_process/upload/batch/",
+                {
+                    "images": [
+                        make_image_file("a.png", color=(0, 0, 255)),
+                        make_image_file("b.png", color=(0, 255, 0), size=(48, 64)),
+                    ]
+                },
+                format="multipart",
+            )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(detect.call_count, 1)
+        self.assertEqual(len(detect.call_args[0][0]), 2)
+        self.assertEqual(response.data["results"], ["감자", "양파"])
+        self.assertEqual(
+            response.data["ingredients"][1], {"name": "양파", "confidences": [None, 0.6]}
+        )
+
+    def test_batch_upload_without_images(self):
+        """예외: 사진이 없으면 400"""
+        self.client.force_authenticate(self.user)
+        response = self.client.post("/ai_process/upload/batch/", {}, format="multipart")
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,109 @@
+import logging
+import threading
+import time
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from articles.models import Article
+from .models import TrendingArticle
+
+# 저장해 둘 인기 게시글 개수
+TRENDING_SIZE = 50
+# 순위가 없을 때 백그라운드 계산을 다시 시도하는 간격(초)
+TRENDING_RETRY_AFTER = 60 * 10
+
+logger = logging.getLogger(__name__)
+
+
+def refresh_trending_articles():
+    """인기 게시글 순위를 다시 계산해 TrendingArticle에 저장합니다. (스케줄러에서 호출)
+
+    순위에서 빠진 게시글만 지우고 나머지는 upsert하므로,
+    여러 프로세스에서 동시에 실행해도 같은 article_id를 중복 INSERT하지 않습니다.
+    """
+    articles = (
+        Article.objects.annotate(
+            score=F("comment_count") + F("like_count") * 3 + F("bookmark_count") * 4
+        )
+        .filter(score__gt=0)
+        .order_by("-score", "-created_at")
+        .values_list("pk", "score")[:TRENDING_SIZE]
+    )
+    trending = [
+        TrendingArticle(article_id=pk, score=score, rank=rank)
+        for rank, (pk, score) in enumerate(articles, start=1)
+    ]
+    with transaction.atomic():
+        TrendingArticle.objects.exclude(
+            article_id__in=[item.article_id for item in trending]
+        ).delete()
+        TrendingArticle.objects.bulk_create(
+            trending,
+            update_conflicts=True,
+            unique_fields=["article"],
+            update_fields=["score", "rank", "updated_at"],
+        )
+    return len(trending)
+
+
+class TrendingRefresher:
+    """순위가 비어 있을 때 요청 밖(백그라운드 스레드)에서 한 번 계산합니다.
+
+    스케줄러가 돌지 않는 환경에서도 인기 게시글이 채워지도록 하며,
+    프로세스마다 동시에 하나, retry_after초에 한 번만 실행합니다.
+    """
+
+    def __init__(self, refresh=None, retry_after=TRENDING_RETRY_AFTER):
+        self.refresh = refresh or refresh_trending_articles
+        self.retry_after = retry_after
+        self._lock = threading.Lock()
+        self._running = False
+        self._requested_at = None
+
+    def request(self):
+        """계산을 시작했으면 True, 이미 실행중이거나 최근에 실행했으면 False"""
+        now = time.monotonic()
+        with self._lock:
+            if self._running or (
+                self._requested_at is not None
+                and now - self._requested_at < self.retry_after
+            ):
+                return False
+            self._running = True
+            self._requested_at = now
+        threading.Thread(target=self._run, name="trending-refresh", daemon=True).start()
+        return True
+
+    def _run(self):
+        try:
+            self.refresh()
+        except Exception:
+            logger.exception("인기 게시글 계산 실패")
+        finally:
+            close_old_connections()
+            with self._lock:
+                self._running = False
+
+
+trending_refresher = TrendingRefresher()
+
+
+def get_trending_articles(limit=10):
+    """미리 계산된 인기 게시글을 순위대로 반환합니다.
+
+    요청 중에는 순위를 계산하거나 저장하지 않습니다.
+    아직 순위가 없으면(첫 실행 전, 점수 있는 글이 없음) 백그라운드 계산을 요청하고
+    최신 게시글을 반환합니다.
+    """
+    articles = list(
+        Article.objects.filter(trending__isnull=False)
+        .select_related("author")
+        .order_by("trending__rank")[:limit]
+    )
+    if not articles:
+        trending_refresher.request()
+        articles = list(
+            Article.objects.select_related("author").order_by("-created_at", "-id")[
+                :limit
+            ]
+        )
+    return articles
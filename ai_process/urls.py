@@ -1,8 +1,21 @@
 from django.urls import path
 
-from .views import ImageUploadView, RecommendView
+from .views import (
+    ImageUploadView,
+    ImageBatchUploadView,
+    ImageUploadJobView,
+    ImageUploadJobDetailView,
+    RecommendView,
+)
 
 urlpatterns = [
     path("upload/", ImageUploadView.as_view(), name="image_upload"),
+    path("upload/batch/", ImageBatchUploadView.as_view(), name="image_upload_batch"),
+    path("upload/jobs/", ImageUploadJobView.as_view(), name="image_upload_job"),
+    path(
+        "upload/jobs/<str:job_id>/",
+        ImageUploadJobDetailView.as_view(),
+        name="image_upload_job_detail",
+    ),
     path("", RecommendView.as_view()),
 ]
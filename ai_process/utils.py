@@ -0,0 +1,31 @@
+import numpy as np
+
+
+def top_k(ids, scores, k=10, exclude=None):
+    """점수가 높은 k개의 id와 점수를 반환합니다.
+
+    전체를 정렬하지 않고 argpartition으로 상위 k개만 고른 뒤 그 k개만 정렬합니다.
+
+    Args:
+        ids(ndarray) : 후보 pk 배열
+        scores(ndarray) : ids와 같은 순서의 점수 배열
+        k(int) : 반환할 개수
+        exclude(iterable) : 제외할 pk 목록 (자신이 작성한 글, 이미 평가한 글 등)
+    return:
+        (상위 pk 배열, 점수 배열) 점수 내림차순
+    """
+    ids = np.asarray(ids)
+    scores = np.asarray(scores, dtype=np.float64)
+    if exclude is not None:
+        exclude = np.fromiter(exclude, dtype=ids.dtype)
+        if len(exclude):
+            mask = ~np.isin(ids, exclude)
+            ids, scores = ids[mask], scores[mask]
+    if k <= 0 or not len(ids):
+        return ids[:0], scores[:0]
+    if k < len(ids):
+        top = np.argpartition(-scores, k - 1)[:k]
+    else:
+        top = np.arange(len(ids))
+    top = top[np.argsort(-scores[top], kind="stable")]
+    return ids[top], scores[top]
@@ -2,10 +2,7 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
 from .serializers import ImageUploadSerializer
-from .models import ImageUpload
-from roboflow import Roboflow
 from rest_framework.permissions import IsAuthenticated
-import os
 from rest_framework import status, permissions
 from rest_framework.response import Response
 from rest_framework.views import APIView
@@ -13,63 +10,155 @@ from articles.models import (
     Article,
 )
 from articles.serializers import ArticleListSerializer
-from ai_process.recommend import collaborative_filtering, content_base
-from .labels import LABELS
-from django.db.models import Count
+from ai_process.recommend import get_recommendations
+from ai_process.trending import get_trending_articles
+from .detection import (
+    decode_image,
+    detect_ingredients_cached,
+    merge_labels,
+    predict_labels_cached,
+)
+from .detection_jobs import detection_queue, DetectionQueueFull
 
 
 class ImageUploadView(APIView):
+    """사물인식
+
+    업로드된 사진을 저장하지 않고 메모리에서 바로 디코딩/축소해 재료를 찾습니다.
+    거의 같은 사진을 다시 올리면 캐시된 결과를 반환합니다. (detection_cache.py)
+    """
+
     parser_classes = (MultiPartParser, FormParser)
     permission_classes = [IsAuthenticated]
 
     def post(self, request, *args, **kwargs):
         image_serializer = ImageUploadSerializer(data=request.data, partial=True)
-        if image_serializer.is_valid():
+        if not image_serializer.is_valid():
+            return Response(image_serializer.errors, status=400)
+        image_file = image_serializer.validated_data.get("image")
+        if image_file is None:
+            return Response({"error": "이미지를 첨부해주세요!"}, status=400)
+        try:
+            image = decode_image(image_file.read())
+        except ValueError as e:
+            return Response({"error": str(e)}, status=400)
+        results = detect_ingredients_cached(image)
+        return Response({"results": results}, status=201)
+
+
+class ImageBatchUploadView(APIView):
+    """여러 장 사물인식
+
+    images 필드로 받은 사진들을 한 번에 사물인식하고,
+    중복을 합친 재료 목록과 재료별/사진별 confidence를 반환합니다.
+    """
+
+    parser_classes = (MultiPartParser, FormParser)
+    permission_classes = [IsAuthenticated]
+    max_images = 10
+
+    def post(self, request):
+        files = request.FILES.getlist("images")
+        if not files:
+            return Response({"error": "이미지를 첨부해주세요!"}, status=400)
+        if len(files) > self.max_images:
+            return Response(
+                {"error": f"이미지는 최대 {self.max_images}장까지 올릴 수 있습니다!"},
+                status=400,
+            )
+        images = []
+        for image_file in files:
+            image_serializer = ImageUploadSerializer(
+                data={"image": image_file}, partial=True
+            )
+            if not image_serializer.is_valid():
+                return Response(image_serializer.errors, status=400)
             try:
-                obj = ImageUpload.objects.get(pk=request.user.id)
-                obj.delete()
-            except:
-                pass
-            image_serializer.save(user=request.user)
-            image_file = image_serializer.validated_data["image"]
-            obj = ImageUpload.objects.get(pk=request.user.id)
-
-            rf = Roboflow(api_key=os.environ.get("RF_API_KEY"))
-            project = rf.workspace().project("cookai")
-            model = project.version("3").model
-
-            prediction = model.predict(
-                "./media/" + str(obj.image), confidence=40, overlap=30
-            ).json()
-            results = []
-            for p in prediction["predictions"]:
-                results.append(LABELS[p["class"]])
-            obj.image.delete(save=False)
-            obj.delete()
-            return Response({"results": results}, status=201)
-        else:
+                images.append(decode_image(image_file.read()))
+            except ValueError as e:
+                return Response({"error": str(e)}, status=400)
+        ingredients = merge_labels(predict_labels_cached(images))
+        return Response(
+            {
+                "results": [ingredient["name"] for ingredient in ingredients],
+                "ingredients": ingredients,
+            },
+            status=201,
+        )
+
+
+def detect_uploaded_bytes(data):
+    return detect_ingredients_cached(decode_image(data))
+
+
+class ImageUploadJobView(APIView):
+    """사물인식 작업 등록
+
+    사진을 작업 큐에 넣고 작업 id를 바로 반환합니다.
+    결과는 ImageUploadJobDetailView에서 조회합니다.
+    """
+
+    parser_classes = (MultiPartParser, FormParser)
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        image_serializer = ImageUploadSerializer(data=request.data, partial=True)
+        if not image_serializer.is_valid():
             return Response(image_serializer.errors, status=400)
+        image_file = image_serializer.validated_data.get("image")
+        if image_file is None:
+            return Response({"error": "이미지를 첨부해주세요!"}, status=400)
+        try:
+            job = detection_queue.submit(
+                request.user.id, detect_uploaded_bytes, image_file.read()
+            )
+        except DetectionQueueFull:
+            return Response(
+                {"error": "요청이 많아 잠시 후 다시 시도해주세요!"},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": "5"},
+            )
+        return Response(job.to_dict(), status=status.HTTP_202_ACCEPTED)
+
+
+class ImageUploadJobDetailView(APIView):
+    """사물인식 작업 조회
+
+    ?wait=초 를 주면 작업이 끝날 때까지 최대 30초 기다립니다. (long polling)
+    """
+
+    permission_classes = [IsAuthenticated]
+    max_wait = 30
+
+    def get(self, request, job_id):
+        try:
+            wait = min(float(request.GET.get("wait", 0)), self.max_wait)
+        except ValueError:
+            wait = 0
+        if wait > 0:
+            job = detection_queue.wait(job_id, request.user.id, wait)
+        else:
+            job = detection_queue.get(job_id, request.user.id)
+        if job is None:
+            return Response(
+                {"error": "작업을 찾을 수 없습니다!"}, status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(job.to_dict(), status=status.HTTP_200_OK)
 
 
 class RecommendView(APIView):
     def get(self, request):
-        func_dict = {"0": collaborative_filtering, "1": content_base}
         if request.user.is_anonymous:
-            articles = (
-                Article.objects.annotate(
-                    score=Count("comment") + Count("like") * 3 + Count("bookmark") * 4
-                )
-                .filter(score__gt=0)
-                .order_by("-score")
-            )
-            articles = articles[:10]
+            # 인기 게시글은 스케줄러가 주기적으로 미리 계산해 둠
+            articles = get_trending_articles(10)
         else:
             select = request.GET.get("recommend", "0")
-            list_of_pk, dictionary = func_dict[select](request.user.id)
+            list_of_pk, dictionary = get_recommendations(request.user.id, select)
+            # list_of_pk는 추천 순서대로 정렬되어 있음
+            order = {pk: index for index, pk in enumerate(list_of_pk)}
             articles = sorted(
-                Article.objects.filter(id__in=list_of_pk),
-                key=lambda x: dictionary[x.id],
-                reverse=True,
+                Article.objects.filter(id__in=list_of_pk).select_related("author"),
+                key=lambda x: order[x.id],
             )
         serializer = ArticleListSerializer(
             articles, many=True, context={"request": request}
@@ -5,6 +5,7 @@ from articles.models import (
     Category,
     Ingredient,
     IngredientLink,
+    IngredientPrice,
     RecipeIngredient,
     Recomment,
 )
@@ -45,6 +46,9 @@ class ArticleAdmin(admin.ModelAdmin):
     readonly_fields = (
         "created_at",
         "updated_at",
+        "like_count",
+        "bookmark_count",
+        "comment_count",
     )
 
     list_display = (
@@ -81,6 +85,7 @@ class CommentAdmin(admin.ModelAdmin):
     readonly_fields = (
         "created_at",
         "updated_at",
+        "like_count",
     )
     list_display = (
         "author",
@@ -134,6 +139,17 @@ class IngredientLinkAdmin(admin.ModelAdmin):
     list_filter = ("link", "link_img", "created_at", "price")
 
 
+@admin.register(IngredientPrice)
+class IngredientPriceAdmin(admin.ModelAdmin):
+    list_display = (
+        "ingredient",
+        "product_id",
+        "price",
+        "day",
+    )
+    list_filter = ("day",)
+
+
 @admin.register(RecipeIngredient)
 class RecipeIngredientAdmin(admin.ModelAdmin):
     pass
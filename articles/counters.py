@@ -0,0 +1,87 @@
+"""좋아요/북마크/댓글 수 비정규화 컬럼 관리
+
+토글 뷰에서는 F()로 1씩 갱신하고(0 미만으로는 내려가지 않음),
+관리자 페이지나 회원 삭제(CASCADE)처럼 뷰를 거치지 않은 변경으로 생긴 차이는
+reconcile_counters로 실제 개수에 맞춥니다.
+"""
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from articles.models import Article, Comment, Recomment
+
+
+def count_subquery(queryset, field="article_id"):
+    """OuterRef("pk")별 개수를 join 없이 서브쿼리로 셉니다."""
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{field: OuterRef("pk")})
+            .values(field)
+            .annotate(count=Count("pk"))
+            .values("count"),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+
+def counter_expression(counter_name, delta):
+    """F(counter_name) + delta, 단 0 미만이면 0
+
+    카운터 컬럼이 생기기 전에 있던 좋아요/댓글은 reconcile_counters 전까지 세지 않은 상태라
+    그대로 빼면 PositiveIntegerField의 CHECK 제약에 걸립니다.
+    """
+    return Greatest(F(counter_name) + delta, 0)
+
+
+def toggle_with_counter(instance, field_name, counter_name, user):
+    """instance의 MtoM 필드에 user를 추가/제거하고 카운터 컬럼을 F()로 갱신합니다.
+
+    Args:
+        instance : Article, Comment, Recomment
+        field_name(str) : MtoM 필드 이름 (like, bookmark)
+        counter_name(str) : 카운터 컬럼 이름 (like_count, bookmark_count)
+        user : 토글할 유저
+    return:
+        추가되었으면 True, 제거되었으면 False
+    """
+    model = type(instance)
+    with transaction.atomic():
+        # 같은 글/댓글의 토글은 행 잠금으로 한 번에 하나씩 처리합니다.
+        # (동시에 눌러도 둘 다 "좋아요 없음"으로 보고 +2 되지 않도록)
+        locked = model.objects.select_for_update().get(pk=instance.pk)
+        relation = getattr(locked, field_name)
+        if relation.filter(pk=user.pk).exists():
+            relation.remove(user)
+            delta = -1
+        else:
+            relation.add(user)
+            delta = 1
+        model.objects.filter(pk=instance.pk).update(
+            **{counter_name: counter_expression(counter_name, delta)}
+        )
+    return delta > 0
+
+
+def add_comment_count(article_id, delta):
+    Article.objects.filter(pk=article_id).update(
+        comment_count=counter_expression("comment_count", delta)
+    )
+
+
+def reconcile_counters():
+    """모든 카운터 컬럼을 실제 개수로 다시 맞춥니다."""
+    with transaction.atomic():
+        articles = Article.objects.update(
+            like_count=count_subquery(Article.like.through.objects.all()),
+            bookmark_count=count_subquery(Article.bookmark.through.objects.all()),
+            comment_count=count_subquery(Comment.objects.all()),
+        )
+        comments = Comment.objects.update(
+            like_count=count_subquery(Comment.like.through.objects.all(), "comment_id")
+        )
+        recomments = Recomment.objects.update(
+            like_count=count_subquery(
+                Recomment.like.through.objects.all(), "recomment_id"
+            )
+        )
+    return articles, comments, recomments
@@ -1,26 +1,144 @@
 import hmac
 import hashlib
+import json
+import logging
 import os
+import random
 import time
+from concurrent.futures import ThreadPoolExecutor
 import requests
-import json
-import urllib.request
+from requests.adapters import HTTPAdapter
+from django.db import transaction
+from django.db.models import Q
 from django.utils import timezone
 from urllib.parse import urlencode
-from articles.models import Ingredient, IngredientLink
+from articles.counters import count_subquery
+from articles.models import (
+    APIRateLimit,
+    Ingredient,
+    IngredientLink,
+    IngredientPrice,
+    RecipeIngredient,
+)
+from users.models import Fridge
 from django.conf import settings
-from ratelimiter import RateLimiter
 from datetime import datetime
+from django.utils.dateparse import parse_datetime
 
 
+logger = logging.getLogger(__name__)
+
 ACCESS_KEY = settings.COUPANG_ACCESS_KEY
 SECRET_KEY = settings.COUPANG_SECRET_KEY
 
+# 쿠팡 API 호출 제한 (60초에 50회)
+COUPANG_MAX_CALLS = 50
+COUPANG_PERIOD = 60
+# 동시 연결 수 (keep-alive 연결 풀 크기)
+COUPANG_POOL_SIZE = 10
+# 실패시 재시도 횟수와 대기 시간(초, 지수 증가 + jitter)
+COUPANG_RETRIES = 3
+COUPANG_BACKOFF = 0.5
+COUPANG_TIMEOUT = 10
+RETRY_STATUS = {429, 500, 502, 503, 504}
+# 상품을 새로 받지 못했을 때 기존 링크를 유지할 기간(일)
+LINK_EXPIRE_DAYS = 5
+
+
+class SlidingWindowLimiter:
+    """전역 호출 제한
+
+    최근 period초 동안의 호출 시각을 APIRateLimit 한 행에 보관해, 어느 period초 구간에서도
+    모든 프로세스의 호출 합계가 max_calls번을 넘지 않도록 합니다.
+    확인과 기록은 그 행을 select_for_update로 잠근 트랜잭션 안에서 합니다.
+
+    Args:
+        name(str) : APIRateLimit 행 이름
+        clock : 테스트용. 현재 시각(epoch 초)을 반환하는 함수
+    """
+
+    def __init__(
+        self,
+        max_calls=COUPANG_MAX_CALLS,
+        period=COUPANG_PERIOD,
+        name="coupang",
+        clock=time.time,
+    ):
+        self.max_calls = max_calls
+        self.period = period
+        self.name = name
+        self.clock = clock
+
+    def try_acquire(self):
+        """호출할 수 있으면 시각을 기록하고 0, 없으면 기다려야 할 시간(초)
+
+        구간 안의 호출이 max_calls번이면 가장 오래된 호출이 구간을 벗어날 때까지 기다립니다.
+        """
+        with transaction.atomic():
+            window, _ = APIRateLimit.objects.select_for_update().get_or_create(
+                name=self.name
+            )
+            now = self.clock()
+            calls = [called for called in window.calls if called + self.period > now]
+            if len(calls) >= self.max_calls:
+                return calls[0] + self.period - now
+            calls.append(now)
+            window.calls = calls
+            window.save(update_fields=["calls"])
+            return 0
+
+    def acquire(self):
+        """호출할 수 있을 때까지 기다립니다. (트랜잭션 밖에서 대기)"""
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                return
+            time.sleep(wait)
+
+
+class CoupangAPIError(Exception):
+    pass
+
+
+def build_session(pool_size=COUPANG_POOL_SIZE):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# 프로세스별 연결 풀과 전체 프로세스 공용 호출 제한
+coupang_session = build_session()
+coupang_api_limiter = SlidingWindowLimiter()
+
 
 class CoupangManage:
+    """쿠팡 파트너스 API 클라이언트
+
+    keep-alive 연결 풀(coupang_session)을 공유하고,
+    요청마다(재시도 포함) coupang_api_limiter 호출 한 번으로 셉니다.
+
+    Args:
+        domain(str) : API 주소 (테스트에서는 로컬 stub 서버)
+    """
+
     DOMAIN = "https://api-gateway.coupang.com"
 
-    # HMAC서명 생성
+    def __init__(
+        self,
+        domain=None,
+        session=None,
+        limiter=None,
+        retries=COUPANG_RETRIES,
+        backoff=COUPANG_BACKOFF,
+    ):
+        self.domain = domain or self.DOMAIN
+        self.session = session or coupang_session
+        self.limiter = limiter or coupang_api_limiter
+        self.retries = retries
+        self.backoff = backoff
+
     def generateHmac(self, method, url, secretKey, accessKey):
         path, *query = url.split("?")
         current_datetime = datetime.utcnow().strftime("%y%m%dT%H%M%SZ")
@@ -34,21 +152,29 @@ class CoupangManage:
         )
 
     def get_productsdata(self, request_method, authorization, url):
-        response = requests.request(
-            method=request_method,
-            url=url,
-            headers={
-                "Authorization": authorization,
-                "Content-Type": "application/json;charset=UTF-8",
-            },
-        )
-        retdata = json.dumps(response.json(), indent=4).encode("utf-8")
-        jsondata = json.loads(retdata)
-        data = jsondata["data"]
-
-        productdata = data["productData"]
-
-        return productdata
+        for attempt in range(self.retries + 1):
+            self.limiter.acquire()
+            try:
+                response = self.session.request(
+                    method=request_method,
+                    url=url,
+                    headers={
+                        "Authorization": authorization,
+                        "Content-Type": "application/json;charset=UTF-8",
+                    },
+                    timeout=COUPANG_TIMEOUT,
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            else:
+                if response.status_code not in RETRY_STATUS:
+                    response.raise_for_status()
+                    return response.json()["data"]["productData"]
+                error = CoupangAPIError(f"status {response.status_code}")
+            if attempt < self.retries:
+                # 여러 스레드가 동시에 재시도하지 않도록 jitter를 줍니다.
+                time.sleep(self.backoff * 2**attempt * random.uniform(0.5, 1.5))
+        raise error
 
     def get_products_by_keyword(self, keyword, limit=10, subld="cookaicookai"):
         request_method = "GET"
@@ -68,7 +194,7 @@ class CoupangManage:
         authorization = self.generateHmac(method, request_url, SECRET_KEY, ACCESS_KEY)
 
         # 요청 URL
-        full_url = "{}{}".format(self.DOMAIN, request_url)
+        full_url = "{}{}".format(self.domain, request_url)
 
         # 상품 데이터 받기
         product_data = self.get_productsdata(request_method, authorization, full_url)
@@ -79,6 +205,7 @@ class CoupangManage:
                 "product_url": product["productUrl"],
                 "product_image_url": product["productImage"],
                 "product_price": product["productPrice"],
+                "product_id": str(product.get("productId") or product["productUrl"]),
             }
             for product in product_data
         ]
@@ -86,60 +213,197 @@ class CoupangManage:
         return products
 
 
-# 전역 변수로 RateLimiter 객체 생성 (60초에 50회 제한)
-coupang_api_limiter = RateLimiter(max_calls=50, period=60)
+def parse_price(value):
+    """상품 가격(숫자 또는 "12,900" 같은 문자열)을 정수로 바꿉니다. 실패하면 None"""
+    try:
+        price = round(float(str(value).replace(",", "")))
+    except (TypeError, ValueError, OverflowError):
+        return None
+    return price if price >= 0 else None
+
+
+def price_records(products_by_ingredient, day):
+    """day의 가격 기록 목록. 같은 상품이 여러 번 나오면 마지막 가격만 남깁니다."""
+    prices = {}
+    for name, products in products_by_ingredient.items():
+        for product in products:
+            price = parse_price(product["product_price"])
+            if price is None:
+                continue
+            product_id = product.get("product_id") or product["product_url"]
+            prices[name, product_id[:100]] = price
+    return [
+        IngredientPrice(ingredient_id=name, product_id=product_id, price=price, day=day)
+        for (name, product_id), price in prices.items()
+    ]
+
+
+def replace_ingredient_links(products_by_ingredient):
+    """여러 재료의 링크를 한 트랜잭션에서 교체합니다.
+
+    새 상품을 받은 재료는 기존 링크를 모두 지우고, 받지 못한 재료는
+    LINK_EXPIRE_DAYS일이 지난 링크만 지웁니다. 새 링크는 bulk_create로 한 번에 저장하고
+    Ingredient.updated_at도 한 번의 UPDATE로 갱신합니다.
+    상품 가격은 IngredientPrice에 (재료, 상품, 날짜)당 한 행으로 upsert합니다.
+
+    Args:
+        products_by_ingredient(dict) : 재료 이름 -> get_products_by_keyword 결과
+    return:
+        DB에 있어서 갱신된 재료 이름 목록
+    """
+    names = list(
+        Ingredient.objects.filter(
+            ingredient_name__in=list(products_by_ingredient)
+        ).values_list("ingredient_name", flat=True)
+    )
+    refreshed = [name for name in names if products_by_ingredient[name]]
+    now = timezone.now()
+    links = [
+        IngredientLink(
+            ingredient_id=name,
+            link=product["product_url"],
+            link_img=product["product_image_url"],
+            price=product["product_price"],
+        )
+        for name in refreshed
+        for product in products_by_ingredient[name]
+    ]
+    prices = price_records(
+        {name: products_by_ingredient[name] for name in refreshed},
+        timezone.localdate(now),
+    )
+    with transaction.atomic():
+        IngredientLink.objects.filter(
+            Q(ingredient_id__in=refreshed)
+            | Q(
+                ingredient_id__in=names,
+                created_at__lt=now - timezone.timedelta(days=LINK_EXPIRE_DAYS),
+            )
+        ).delete()
+        IngredientLink.objects.bulk_create(links)
+        # 같은 날 다시 검색하면 가격만 최신 값으로 바꿉니다.
+        IngredientPrice.objects.bulk_create(
+            prices,
+            update_conflicts=True,
+            unique_fields=["ingredient", "product_id", "day"],
+            update_fields=["price"],
+        )
+        # 모든 링크가 저장된 후에 Ingredient의 updated_at을 업데이트
+        Ingredient.objects.filter(ingredient_name__in=names).update(updated_at=now)
+    return names
 
 
 def save_coupang_links_to_ingredient_links(ingredient_name):
-    # CoupangManage 객체 생성
+    # Ingredient DB에 없는 재료는 API를 호출하지 않습니다.
+    if not Ingredient.objects.filter(ingredient_name=ingredient_name).exists():
+        logger.info("%s 은(는) 데이터베이스에 없습니다.", ingredient_name)
+        return
+
+    # 키워드를 기반으로 상품 정보 검색 (호출 제한은 CoupangManage에서 적용)
+    product_links = CoupangManage().get_products_by_keyword(ingredient_name, 10)
+    replace_ingredient_links({ingredient_name: product_links})
+
+
+def fetch_products(ingredient_names, workers=COUPANG_POOL_SIZE):
+    """여러 재료의 상품을 동시에 검색합니다. (호출 제한은 CoupangManage에서 적용)
+
+    return:
+        재료 이름 -> 상품 목록, 검색에 실패한 재료는 빠집니다.
+    """
     coupang_api = CoupangManage()
 
-    # ratelimiter 적용하여 키워드를 기반으로 상품 정보 검색
-    with coupang_api_limiter:
-        product_links = coupang_api.get_products_by_keyword(ingredient_name, 10)
+    def fetch(ingredient_name):
+        try:
+            return coupang_api.get_products_by_keyword(ingredient_name, 10)
+        except (requests.RequestException, CoupangAPIError, KeyError) as e:
+            logger.warning("%s 상품 검색 실패: %s", ingredient_name, e)
+            return None
 
-    # Ingredient DB에서 Ingredient_name 찾기
-    try:
-        ingredient = Ingredient.objects.get(ingredient_name=ingredient_name)
-    except Ingredient.DoesNotExist:
-        print(f"{ingredient_name} 은(는) 데이터베이스에 없습니다.")
-        return
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(workers, len(ingredient_names)))
+    ) as executor:
+        results = executor.map(fetch, ingredient_names)
+        return {
+            name: products
+            for name, products in zip(ingredient_names, results)
+            if products is not None
+        }
 
-    # 기존에 저장된 5일 전의 IngredientLinks 삭제
-    old_links = IngredientLink.objects.filter(
-        ingredient=ingredient,
-        created_at__lt=timezone.now() - timezone.timedelta(days=5),
-    )
-    old_links.delete()
 
-    for link_data in product_links:
-        link = link_data["product_url"]
-        link_img = link_data["product_image_url"]
-        price = link_data["product_price"]
+def save_coupang_links_to_ingredients(ingredient_names):
+    """여러 재료의 상품을 검색한 뒤 한 트랜잭션으로 저장합니다.
 
-        # 생성된 link 와 link_img를 IngredientLink DB에 저장
-        ingredient_link = IngredientLink(
-            ingredient=ingredient, link=link, link_img=link_img, price=price
-        )
-        ingredient_link.save()
-        ingredient.save()
+    검색에 실패한 재료는 건너뜁니다. 반환값은 저장된 재료 이름 목록
+    """
+    if not ingredient_names:
+        return []
+    products_by_ingredient = fetch_products(ingredient_names)
+    if not products_by_ingredient:
+        return []
+    return replace_ingredient_links(products_by_ingredient)
 
-    # 모든 링크가 저장된 후서야 Ingredient의 updated_at을 업데이트
-    ingredient.update_timestamp()
 
+def stale_ingredient_names(cutoff):
+    """cutoff 전에 갱신된(또는 갱신된 적 없는) 재료 이름 목록
 
-def update_ingredient_links(interval_days=3):
-    new_ingredients = Ingredient.objects.filter(
-        updated_at__isnull=True
-    ) | Ingredient.objects.filter(
-        updated_at__lt=timezone.now() - timezone.timedelta(days=interval_days)
+    레시피와 냉장고에서 많이 쓰이는 재료부터 정렬합니다.
+    """
+    return list(
+        Ingredient.objects.filter(Q(updated_at__isnull=True) | Q(updated_at__lt=cutoff))
+        .annotate(
+            priority=count_subquery(RecipeIngredient.objects.all(), "ingredient_id")
+            + count_subquery(Fridge.objects.all(), "ingredient_id")
+        )
+        .order_by("-priority", "ingredient_name")
+        .values_list("ingredient_name", flat=True)
     )
 
-    for ingredient in new_ingredients:
-        ingredient_name = ingredient.ingredient_name
-        with coupang_api_limiter:
-            save_coupang_links_to_ingredient_links(ingredient_name)
-        ingredient.updated_at = timezone.now()
-        ingredient.save()
+
+def get_checkpoint_path():
+    return str(settings.INGREDIENT_LINK_CHECKPOINT)
+
+
+def read_checkpoint():
+    try:
+        with open(get_checkpoint_path(), encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def write_checkpoint(cutoff, done, finished):
+    """진행 상황을 원자적으로 기록합니다."""
+    path = get_checkpoint_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"cutoff": cutoff.isoformat(), "done": done, "finished": finished}, f)
+    os.replace(tmp_path, path)
+
+
+def update_ingredient_links(interval_days=3, batch_size=50):
+    """오래된 재료 링크를 일괄 갱신합니다. (스케줄러에서 매일 실행)
+
+    우선순위 순서대로 batch_size개씩 동시에 검색하고 배치마다 한 트랜잭션으로 저장합니다.
+    배치마다 체크포인트를 기록하고, 이전 실행이 중간에 끝났으면 같은 기준 시각(cutoff)으로
+    이어서 실행합니다. 이미 저장된 재료는 updated_at이 갱신되어 다시 검색하지 않습니다.
+
+    return:
+        갱신된 재료 수
+    """
+    checkpoint = read_checkpoint()
+    if checkpoint and not checkpoint["finished"]:
+        cutoff = parse_datetime(checkpoint["cutoff"])
+        done = checkpoint["done"]
     else:
-        print("coupang")
+        cutoff = timezone.now() - timezone.timedelta(days=interval_days)
+        done = 0
+    names = stale_ingredient_names(cutoff)
+    write_checkpoint(cutoff, done, finished=False)
+    for start in range(0, len(names), batch_size):
+        done += len(
+            save_coupang_links_to_ingredients(names[start : start + batch_size])
+        )
+        write_checkpoint(cutoff, done, finished=False)
+    write_checkpoint(cutoff, done, finished=True)
+    return done
@@ -0,0 +1,120 @@
+"""재료 이름 n-gram 역색인
+
+search_ingredient가 검색어마다 Ingredient에 icontains(LIKE '%x%')를 보내지 않도록,
+재료 이름의 글자 1~3-gram -> 재료 이름 집합을 프로세스 메모리에 유지합니다.
+검색어의 3-gram(짧으면 검색어 자체) 집합을 교집합한 뒤 부분 문자열인지 확인합니다.
+
+Ingredient가 생성/삭제되면 signals.py에서 해당 이름만 갱신하고,
+다른 프로세스에서 바뀐 재료는 INDEX_MAX_AGE가 지나면 다시 만들어 반영합니다.
+"""
+import threading
+import time
+from .models import Ingredient
+
+# 인덱스 최대 유지 시간(초). 지나면 다음 조회 때 DB에서 다시 만듭니다.
+INDEX_MAX_AGE = 60 * 10
+MAX_GRAM = 3
+
+
+def name_grams(name):
+    """이름의 모든 1~3-gram"""
+    return {
+        name[i : i + n]
+        for n in range(1, MAX_GRAM + 1)
+        for i in range(len(name) - n + 1)
+    }
+
+
+def query_grams(term):
+    """검색어를 찾기 위해 확인할 gram. 길면 3-gram, 짧으면 검색어 자체"""
+    if len(term) <= MAX_GRAM:
+        return {term}
+    return {term[i : i + MAX_GRAM] for i in range(len(term) - MAX_GRAM + 1)}
+
+
+class IngredientNameIndex:
+    """재료 이름 n-gram 역색인
+
+    Attributes:
+        version(int) : 인덱스가 바뀔 때마다 1씩 증가합니다.
+    """
+
+    def __init__(self, max_age=INDEX_MAX_AGE):
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self.reset()
+
+    def reset(self):
+        """인덱스를 비웁니다. 다음 조회 때 DB에서 다시 만듭니다."""
+        with self._lock:
+            self._built_at = None
+            self._postings = {}
+            self._names = set()
+            self.version = 0
+
+    def _build(self):
+        self._postings = {}
+        self._names = set()
+        for name in Ingredient.objects.values_list("ingredient_name", flat=True):
+            self._add(name)
+        self._built_at = time.monotonic()
+        self.version += 1
+
+    def _ensure_built(self):
+        if self._built_at is None or time.monotonic() - self._built_at > self.max_age:
+            self._build()
+
+    def _add(self, name):
+        if name in self._names:
+            return
+        self._names.add(name)
+        for gram in name_grams(name.lower()):
+            self._postings.setdefault(gram, set()).add(name)
+
+    def add(self, names):
+        with self._lock:
+            if self._built_at is None:
+                return
+            for name in names:
+                self._add(name)
+            self.version += 1
+
+    def remove(self, names):
+        with self._lock:
+            if self._built_at is None:
+                return
+            for name in names:
+                if name not in self._names:
+                    continue
+                self._names.discard(name)
+                for gram in name_grams(name.lower()):
+                    postings = self._postings.get(gram)
+                    if postings is not None:
+                        postings.discard(name)
+                        if not postings:
+                            del self._postings[gram]
+            self.version += 1
+
+    def lookup(self, term):
+        """이름에 term이 들어간 재료 이름 집합 (대소문자 무시)"""
+        term = term.strip().lower()
+        if not term:
+            return set()
+        with self._lock:
+            self._ensure_built()
+            postings = [self._postings.get(gram) for gram in query_grams(term)]
+            if not all(postings):
+                return set()
+            postings.sort(key=len)
+            candidates = postings[0].intersection(*postings[1:])
+        return {name for name in candidates if term in name.lower()}
+
+    def search(self, terms):
+        """여러 검색어 중 하나라도 들어간 재료 이름 집합"""
+        names = set()
+        for term in terms:
+            names |= self.lookup(term)
+        return names
+
+
+ingredient_name_index = IngredientNameIndex()
@@ -0,0 +1,115 @@
+"""쿠팡 상품 링크 갱신 큐
+
+LinkPlusView가 요청 안에서 재료마다 쿠팡 API를 순서대로 호출하지 않도록,
+링크가 없거나 오래된 재료를 백그라운드 스레드에서 갱신합니다.
+이미 갱신중인 재료는 다시 넣지 않고(in-flight 중복 제거),
+갱신이 끝난 재료는 REFRESH_RETRY_AFTER초 동안 다시 넣지 않습니다. (API 오류시 반복 호출 방지)
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.db import close_old_connections
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+from .coupang import save_coupang_links_to_ingredient_links
+from .models import Ingredient, IngredientLink
+
+# 링크 유효 기간(일). 지나면 갱신합니다.
+LINK_MAX_AGE_DAYS = 5
+# 동시에 갱신할 재료 수 (쿠팡 API 호출 제한은 coupang.py에서 따로 적용)
+LINK_REFRESH_WORKERS = 2
+# 갱신이 끝난 재료를 다시 넣지 않는 시간(초)
+REFRESH_RETRY_AFTER = 60
+
+logger = logging.getLogger(__name__)
+
+
+def stale_ingredients(ingredient_names):
+    """링크가 없거나 LINK_MAX_AGE_DAYS일이 지난 재료 이름 목록"""
+    expired_at = timezone.now() - timezone.timedelta(days=LINK_MAX_AGE_DAYS)
+    has_link = Exists(IngredientLink.objects.filter(ingredient_id=OuterRef("pk")))
+    return list(
+        Ingredient.objects.filter(ingredient_name__in=ingredient_names)
+        .filter(~has_link | Q(updated_at__isnull=True) | Q(updated_at__lte=expired_at))
+        .values_list("ingredient_name", flat=True)
+    )
+
+
+class LinkRefreshQueue:
+    """재료 링크 갱신 큐
+
+    Args:
+        refresh(callable) : 재료 이름 하나의 링크를 갱신하는 함수
+    """
+
+    def __init__(
+        self,
+        refresh=save_coupang_links_to_ingredient_links,
+        max_workers=LINK_REFRESH_WORKERS,
+        retry_after=REFRESH_RETRY_AFTER,
+    ):
+        self.refresh = refresh
+        self.max_workers = max_workers
+        self.retry_after = retry_after
+        self._lock = threading.Lock()
+        self._in_flight = set()
+        self._finished_at = {}
+        self._executor = None
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="link-refresh"
+            )
+        return self._executor
+
+    def enqueue(self, ingredient_names):
+        """재료들의 갱신을 예약하고, 그중 갱신중인 재료 이름 집합을 반환합니다."""
+        now = time.monotonic()
+        submitted = []
+        with self._lock:
+            refreshing = set()
+            for name in ingredient_names:
+                if name in self._in_flight:
+                    refreshing.add(name)
+                    continue
+                finished_at = self._finished_at.get(name)
+                if finished_at is not None and now - finished_at < self.retry_after:
+                    continue
+                self._in_flight.add(name)
+                refreshing.add(name)
+                submitted.append(name)
+            executor = self._get_executor() if submitted else None
+        for name in submitted:
+            executor.submit(self._run, name)
+        return refreshing
+
+    def is_refreshing(self, ingredient_name):
+        with self._lock:
+            return ingredient_name in self._in_flight
+
+    def _run(self, ingredient_name):
+        try:
+            self.refresh(ingredient_name)
+        except Exception:
+            logger.exception("%s 링크 갱신 실패", ingredient_name)
+        finally:
+            close_old_connections()
+            with self._lock:
+                self._in_flight.discard(ingredient_name)
+                self._finished_at[ingredient_name] = time.monotonic()
+                self._purge()
+
+    def _purge(self):
+        now = time.monotonic()
+        expired = [
+            name
+            for name, finished_at in self._finished_at.items()
+            if now - finished_at >= self.retry_after
+        ]
+        for name in expired:
+            del self._finished_at[name]
+
+
+link_refresh_queue = LinkRefreshQueue()
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+from articles.search import rebuild_search_documents, setup_search_index
+
+
+class Command(BaseCommand):
+    help = "게시글 검색 색인을 만들고 모든 게시글의 검색 문서를 다시 만듭니다."
+
+    def handle(self, *args, **options):
+        setup_search_index()
+        count = rebuild_search_documents()
+        self.stdout.write(self.style.SUCCESS(f"indexed {count} articles"))
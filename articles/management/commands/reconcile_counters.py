@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from articles.counters import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = "게시글/댓글/대댓글의 좋아요, 북마크, 댓글 수 컬럼을 실제 개수로 맞춥니다."
+
+    def handle(self, *args, **options):
+        articles, comments, recomments = reconcile_counters()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"reconciled {articles} articles, {comments} comments, {recomments} recomments"
+            )
+        )
@@ -44,11 +44,19 @@ class Article(models.Model):
     image(Url) : 이미지, 이미지Url로 불러오기
     like(MtoM) : User모델과 MtoM, 역참조 : Likes, 빈 값 가능, 중간 모델 : Like
     bookmark(MtoM) : User모델과 MtoM, 역참조 : Bookmarks, 빈 값 가능, 중간 모델 : Bookmark
+    like_count(Int) : 좋아요 수, 좋아요 토글시 F()로 갱신, (-like_count, -id) 인덱스
+    bookmark_count(Int) : 북마크 수, 북마크 토글시 F()로 갱신
+    comment_count(Int) : 댓글 수, 댓글 작성/삭제시 F()로 갱신
 
     """
 
     class Meta:
         db_table = "Article"
+        # 커서 페이지네이션 정렬용 (paginations.KeysetPagination)
+        indexes = [
+            models.Index(fields=["-created_at", "-id"]),
+            models.Index(fields=["-like_count", "-id"]),
+        ]
 
     author = models.ForeignKey(
         User,
@@ -89,6 +97,15 @@ class Article(models.Model):
         related_name="bookmarks",
         blank=True,
     )
+    like_count = models.PositiveIntegerField(
+        default=0,
+    )
+    bookmark_count = models.PositiveIntegerField(
+        default=0,
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+    )
     tags = TaggableManager(
         blank=True,
     )
@@ -104,6 +121,31 @@ class Article(models.Model):
         return result
 
 
+class ArticleSearch(models.Model):
+    """게시글 검색 문서 모델
+
+    제목/내용/레시피를 글자 단위 n-gram으로 나눈 검색 문서입니다.
+    게시글 저장시 signals.py에서 갱신하고, 실제 색인은 DB가 관리합니다. (search.py)
+
+    Attributes:
+    article(OtoO) : 게시글, 역참조 : search
+    document(Text) : 공백으로 구분된 n-gram 토큰
+    """
+
+    article = models.OneToOneField(
+        Article,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="search",
+    )
+    document = models.TextField(
+        default="",
+    )
+
+    def __str__(self):
+        return str(self.article)
+
+
 class Comment(models.Model):
 
     """댓글 모델
@@ -115,12 +157,17 @@ class Comment(models.Model):
     author(OtoO) : 작성자 int(역참조 : comments)
     article(ForeignKey) : 글 int
     comment(text) : 댓글 내용, 300자 제한, str
+    like_count(Int) : 좋아요 수, 좋아요 토글시 F()로 갱신
     updated_at (date): 수정시간
     created_at (date): 가입시간
     """
 
-    class meta:
-        db_table = "Comment"
+    class Meta:
+        # 커서 페이지네이션 정렬용 (paginations.KeysetPagination)
+        indexes = [
+            models.Index(fields=["article", "-created_at", "-id"]),
+            models.Index(fields=["article", "-like_count", "-id"]),
+        ]
 
     author = models.ForeignKey(
         User,
@@ -146,6 +193,9 @@ class Comment(models.Model):
         related_name="like_comments",
         blank=True,
     )
+    like_count = models.PositiveIntegerField(
+        default=0,
+    )
     updated_at = models.DateTimeField(
         auto_now=True,
     )
@@ -158,8 +208,12 @@ class Comment(models.Model):
 
 
 class Recomment(models.Model):
-    class meta:
-        db_table = "Recomment"
+    class Meta:
+        # 커서 페이지네이션 정렬용 (paginations.KeysetPagination)
+        indexes = [
+            models.Index(fields=["article", "-created_at", "-id"]),
+            models.Index(fields=["article", "-like_count", "-id"]),
+        ]
 
     author = models.ForeignKey(
         User,
@@ -182,6 +236,9 @@ class Recomment(models.Model):
         related_name="like_recomments",
         blank=True,
     )
+    like_count = models.PositiveIntegerField(
+        default=0,
+    )
     updated_at = models.DateTimeField(
         auto_now=True,
     )
@@ -272,3 +329,68 @@ class IngredientLink(models.Model):
 
     def __str__(self):
         return str(self.ingredient)
+
+
+class IngredientPrice(models.Model):
+    """재료 상품 가격 기록 모델
+
+    쿠팡 상품 검색 결과의 가격을 상품별로 하루 한 행씩 저장합니다.
+    IngredientLink는 최신 링크만 유지하므로 가격 추이는 이 모델에서 조회합니다. (prices.py)
+    day 기준으로 오래된 기록을 지우거나 파티션을 나눌 수 있도록 day 인덱스를 둡니다.
+
+    Attributes:
+    ingredient(ForeignKey) : 재료, CASCADE
+    product_id(Char) : 쿠팡 상품 id, 100자 제한
+    price(Int) : 가격(원)
+    day(Date) : 수집 날짜, (재료, 상품, 날짜)당 한 행
+    """
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["ingredient", "product_id", "day"],
+                name="unique_ingredient_price_per_day",
+            ),
+        ]
+        indexes = [
+            # 재료별 기간 최저가/평균가 조회용
+            models.Index(fields=["ingredient", "day", "price"]),
+            models.Index(fields=["day"]),
+        ]
+
+    ingredient = models.ForeignKey(
+        Ingredient,
+        on_delete=models.CASCADE,
+        db_index=False,
+    )
+    product_id = models.CharField(
+        max_length=100,
+    )
+    price = models.PositiveIntegerField()
+    day = models.DateField()
+
+    def __str__(self):
+        return f"{self.ingredient_id} {self.day} {self.price}"
+
+
+class APIRateLimit(models.Model):
+    """외부 API 호출 기록 모델
+
+    여러 프로세스(gunicorn 워커, 스케줄러)가 같은 호출 한도를 나눠 쓰도록
+    최근 호출 시각 목록을 DB의 한 행에 저장합니다. (coupang.SlidingWindowLimiter)
+
+    Attributes:
+    name(Char) : 한도 이름, 기본키
+    calls(JSON) : 최근 period초 안의 호출 시각(epoch 초) 목록, 오래된 순
+    """
+
+    name = models.CharField(
+        max_length=50,
+        primary_key=True,
+    )
+    calls = models.JSONField(
+        default=list,
+    )
+
+    def __str__(self):
+        return str(self.name)
@@ -1,11 +1,120 @@
+import base64
+import json
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 """
 pagination을 커스텀 하거나, 필요한 곳에 지정하여 사용할 수 있습니다.
 """
 
 
-class ArticlePagination(PageNumberPagination):
+class KeysetPagination(PageNumberPagination):
+    """KeysetPagination: 커서(keyset) 페이지네이션을 위한 클래스
+
+    queryset이 keyset_fields 중 하나(+-)로 정렬되어 있으면 (정렬 필드, id)를 커서로 써서
+    OFFSET과 COUNT(*) 없이 다음 페이지를 가져옵니다. (무한 스크롤)
+    page_query_param이 있거나 keyset으로 정렬할 수 없는 queryset이면
+    기존처럼 페이지 번호로 동작합니다.
+
+    Attributes:
+        cursor_query_param (str): 커서 이름 ex)?cursor=WyIyMDIz... 응답의 next를 그대로 사용
+        keyset_fields (tuple): 커서로 쓸 수 있는 정렬 필드. 같은 값은 id로 구분합니다.
+    """
+
+    cursor_query_param = "cursor"
+    keyset_fields = ("created_at", "like_count", "id", "pk")
+
+    def get_keyset(self, queryset):
+        """(정렬 필드, 내림차순 여부), keyset으로 정렬할 수 없으면 None"""
+        ordering = queryset.query.order_by
+        if len(ordering) != 1 or not isinstance(ordering[0], str):
+            return None
+        field = ordering[0].lstrip("-")
+        if field not in self.keyset_fields:
+            return None
+        if field == "id":
+            field = "pk"
+        return field, ordering[0].startswith("-")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        keyset = self.get_keyset(queryset)
+        self.use_page_numbers = (
+            keyset is None or self.page_query_param in request.query_params
+        )
+        if self.use_page_numbers:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        field, descending = keyset
+        page_size = self.get_page_size(request)
+        lookup = "lt" if descending else "gt"
+        prefix = "-" if descending else ""
+        ordering = (
+            [prefix + field] if field == "pk" else [prefix + field, prefix + "pk"]
+        )
+        queryset = queryset.order_by(*ordering)
+
+        cursor = self.decode_cursor(request)
+        if cursor is not None:
+            value, pk = cursor
+            if field == "pk":
+                queryset = queryset.filter(**{f"pk__{lookup}": pk})
+            else:
+                value = queryset.model._meta.get_field(field).to_python(value)
+                queryset = queryset.filter(
+                    Q(**{f"{field}__{lookup}": value})
+                    | Q(**{field: value, f"pk__{lookup}": pk})
+                )
+
+        results = list(queryset[: page_size + 1])
+        self.next_cursor = None
+        if len(results) > page_size:
+            results = results[:page_size]
+            last = results[-1]
+            self.next_cursor = (
+                None if field == "pk" else getattr(last, field),
+                last.pk,
+            )
+        return results
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            value, pk = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            return value, int(pk)
+        except (TypeError, ValueError):
+            raise NotFound("Invalid cursor")
+
+    def encode_cursor(self, cursor):
+        value, pk = cursor
+        if hasattr(value, "isoformat"):
+            value = value.isoformat()
+        return base64.urlsafe_b64encode(json.dumps([value, pk]).encode()).decode()
+
+    def get_next_link(self):
+        if self.use_page_numbers:
+            return super().get_next_link()
+        if self.next_cursor is None:
+            return None
+        url = remove_query_param(
+            self.request.build_absolute_uri(), self.page_query_param
+        )
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.next_cursor)
+        )
+
+    def get_paginated_response(self, data):
+        if self.use_page_numbers:
+            return super().get_paginated_response(data)
+        return Response({"next": self.get_next_link(), "results": data})
+
+
+class ArticlePagination(KeysetPagination):
     """ArticlePagination: 페이지네이션을 위한 클래스
 
     Attributes:
@@ -19,7 +128,7 @@ class ArticlePagination(PageNumberPagination):
     max_page_size = 100
 
 
-class CommentPagination(PageNumberPagination):
+class CommentPagination(KeysetPagination):
     """CommentPagination: 댓글 페이지네이션을 위한 클래스
 
     Attributes:
@@ -33,7 +142,7 @@ class CommentPagination(PageNumberPagination):
     max_page_size = 100
 
 
-class ReCommentPagination(PageNumberPagination):
+class ReCommentPagination(KeysetPagination):
     """CommentPagination: 대댓글 페이지네이션을 위한 클래스
 
     Attributes:
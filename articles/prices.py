@@ -0,0 +1,70 @@
+"""재료 가격 추이 조회
+
+상품 검색 때마다 IngredientPrice에 쌓인 가격으로 재료별 최저가/평균가/추이를 계산합니다.
+쿠팡 API를 다시 호출하지 않고 (재료, 날짜, 가격) 인덱스에서 집계합니다.
+"""
+from django.db.models import Avg, Min
+from django.utils import timezone
+from articles.models import IngredientPrice
+
+# 기본 조회 기간(일)
+PRICE_WINDOW_DAYS = 30
+# 최대 조회 기간(일)
+PRICE_MAX_WINDOW_DAYS = 365
+
+
+def price_window(days=PRICE_WINDOW_DAYS):
+    """오늘을 포함한 최근 days일 가격 기록"""
+    since = timezone.localdate() - timezone.timedelta(days=days - 1)
+    return IngredientPrice.objects.filter(day__gte=since)
+
+
+def price_trend(ingredient_names, days=PRICE_WINDOW_DAYS):
+    """재료별 날짜순 일간 최저가/평균가
+
+    return:
+        재료 이름 -> [{"day", "min", "avg"}, ...]
+    """
+    rows = (
+        price_window(days)
+        .filter(ingredient_id__in=ingredient_names)
+        .values("ingredient_id", "day")
+        .annotate(min=Min("price"), avg=Avg("price"))
+        .order_by("ingredient_id", "day")
+    )
+    trend = {}
+    for row in rows:
+        trend.setdefault(row["ingredient_id"], []).append(
+            {"day": row["day"], "min": row["min"], "avg": round(row["avg"])}
+        )
+    return trend
+
+
+def price_summary(ingredient_names, days=PRICE_WINDOW_DAYS):
+    """재료별 기간 최저가/평균가와 일간 추이
+
+    가격 기록이 없는 재료는 결과에서 빠집니다.
+
+    return:
+        [{"ingredient", "min", "avg", "change", "trend"}, ...] 최저가 순
+        change는 첫날 대비 마지막 날 최저가 차이(원)
+    """
+    rows = (
+        price_window(days)
+        .filter(ingredient_id__in=ingredient_names)
+        .values("ingredient_id")
+        .annotate(min=Min("price"), avg=Avg("price"))
+        .order_by("min", "ingredient_id")
+    )
+    trend = price_trend(ingredient_names, days)
+    return [
+        {
+            "ingredient": row["ingredient_id"],
+            "min": row["min"],
+            "avg": round(row["avg"]),
+            "change": trend[row["ingredient_id"]][-1]["min"]
+            - trend[row["ingredient_id"]][0]["min"],
+            "trend": trend[row["ingredient_id"]],
+        }
+        for row in rows
+    ]
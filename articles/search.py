@@ -0,0 +1,217 @@
+"""게시글 전문 검색
+
+title/content/recipe의 icontains(LIKE '%x%') 대신 n-gram 역색인으로 검색합니다.
+한국어는 띄어쓰기 단위로 나누면 "김치찌개"에서 "찌개"를 찾을 수 없으므로,
+단어를 글자(unigram)와 두 글자(bigram)로 나눈 토큰을 ArticleSearch.document에 저장합니다.
+
+색인은 DB 종류에 따라 다르게 만들고(post_migrate), document가 바뀌면 DB가 갱신합니다.
+    PostgreSQL : document의 tsvector 생성 컬럼 + GIN 인덱스, ts_rank로 정렬
+    SQLite : document를 원본으로 하는 FTS5 가상 테이블 + 트리거, bm25로 정렬
+    그 외 : document LIKE 검색 (정렬 없음)
+"""
+import re
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, When
+from django.utils.html import strip_tags
+from .models import Article, ArticleSearch
+
+# 관련도순 정렬에 쓰는 상위 결과 개수 (검색 결과 자체는 제한 없음)
+SEARCH_LIMIT = 1000
+# 밑줄은 FTS5 tokenizer에서 구분자이므로 단어에서 제외합니다.
+WORD_RE = re.compile(r"[^\W_]+")
+
+SEARCH_TABLE = ArticleSearch._meta.db_table
+
+
+def ngram_tokens(text):
+    """문서용 토큰: 단어별 unigram + bigram"""
+    tokens = []
+    for word in WORD_RE.findall(text.lower()):
+        tokens.extend(word)
+        tokens.extend(word[i : i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+def query_tokens(text):
+    """검색어용 토큰: 한 글자 단어는 unigram, 나머지는 bigram (모두 포함해야 검색됨)"""
+    tokens = []
+    for word in WORD_RE.findall(text.lower()):
+        if len(word) == 1:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i : i + 2] for i in range(len(word) - 1))
+    return list(dict.fromkeys(tokens))
+
+
+def build_document(article):
+    """게시글의 검색 문서. 제목은 두 번 넣어 가중치를 줍니다."""
+    text = " ".join(
+        [
+            article.title or "",
+            article.title or "",
+            article.content or "",
+            strip_tags(article.recipe or ""),
+        ]
+    )
+    return " ".join(ngram_tokens(text))
+
+
+def update_search_document(article):
+    ArticleSearch.objects.update_or_create(
+        article_id=article.pk, defaults={"document": build_document(article)}
+    )
+
+
+def rebuild_search_documents(batch_size=500):
+    """모든 게시글의 검색 문서를 다시 만듭니다. 반환값은 게시글 수"""
+    ArticleSearch.objects.all().delete()
+    articles = Article.objects.only("pk", "title", "content", "recipe").order_by("pk")
+    documents = [
+        ArticleSearch(article_id=article.pk, document=build_document(article))
+        for article in articles.iterator(chunk_size=batch_size)
+    ]
+    ArticleSearch.objects.bulk_create(documents, batch_size=batch_size)
+    return len(documents)
+
+
+class PostgresSearchBackend:
+    def setup(self, cursor):
+        cursor.execute(
+            f"ALTER TABLE {SEARCH_TABLE} ADD COLUMN IF NOT EXISTS vector tsvector "
+            "GENERATED ALWAYS AS (to_tsvector('simple', document)) STORED"
+        )
+        cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS {SEARCH_TABLE}_vector_gin "
+            f"ON {SEARCH_TABLE} USING gin (vector)"
+        )
+
+    def tsquery(self, tokens):
+        return " & ".join(f"'{token}'" for token in tokens)
+
+    def match(self, tokens):
+        return ArticleSearch.objects.extra(
+            where=["vector @@ to_tsquery('simple', %s)"],
+            params=[self.tsquery(tokens)],
+        )
+
+    def search(self, cursor, tokens, limit):
+        cursor.execute(
+            f"SELECT article_id FROM {SEARCH_TABLE}, to_tsquery('simple', %s) query "
+            "WHERE vector @@ query "
+            "ORDER BY ts_rank(vector, query) DESC, article_id DESC LIMIT %s",
+            [self.tsquery(tokens), limit],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+class SqliteSearchBackend:
+    fts_table = f"{SEARCH_TABLE}_fts"
+
+    def setup(self, cursor):
+        fts, table = self.fts_table, SEARCH_TABLE
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+            f"document, content='{table}', content_rowid='article_id', "
+            "tokenize='unicode61 remove_diacritics 0')"
+        )
+        insert = (
+            f"INSERT INTO {fts}(rowid, document) VALUES (new.article_id, new.document);"
+        )
+        delete = (
+            f"INSERT INTO {fts}({fts}, rowid, document) "
+            "VALUES ('delete', old.article_id, old.document);"
+        )
+        for name, event, body in (
+            ("ai", "INSERT", insert),
+            ("ad", "DELETE", delete),
+            ("au", "UPDATE", delete + insert),
+        ):
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_{name} AFTER {event} ON {table} "
+                f"BEGIN {body} END"
+            )
+        # 트리거 생성 전에 들어간 문서까지 색인합니다.
+        cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+    def fts_query(self, tokens):
+        return " AND ".join(f'"{token}"' for token in tokens)
+
+    def match(self, tokens):
+        fts = self.fts_table
+        return ArticleSearch.objects.extra(
+            where=[f"article_id IN (SELECT rowid FROM {fts} WHERE {fts} MATCH %s)"],
+            params=[self.fts_query(tokens)],
+        )
+
+    def search(self, cursor, tokens, limit):
+        cursor.execute(
+            f"SELECT rowid FROM {self.fts_table} WHERE {self.fts_table} MATCH %s "
+            f"ORDER BY bm25({self.fts_table}), rowid DESC LIMIT %s",
+            [self.fts_query(tokens), limit],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+class LikeSearchBackend:
+    def setup(self, cursor):
+        pass
+
+    def match(self, tokens):
+        queryset = ArticleSearch.objects.all()
+        for token in tokens:
+            queryset = queryset.filter(document__contains=token)
+        return queryset
+
+    def search(self, cursor, tokens, limit):
+        return list(
+            self.match(tokens)
+            .order_by("-article_id")
+            .values_list("article_id", flat=True)[:limit]
+        )
+
+
+SEARCH_BACKENDS = {
+    "postgresql": PostgresSearchBackend,
+    "sqlite": SqliteSearchBackend,
+}
+
+
+def get_search_backend(using_connection=None):
+    vendor = (using_connection or connection).vendor
+    return SEARCH_BACKENDS.get(vendor, LikeSearchBackend)()
+
+
+def setup_search_index(using_connection=None):
+    """DB 종류에 맞는 검색 색인을 만듭니다. (post_migrate)"""
+    using_connection = using_connection or connection
+    with using_connection.cursor() as cursor:
+        get_search_backend(using_connection).setup(cursor)
+
+
+def search_filter(text):
+    """검색어가 포함된 모든 게시글의 filter 조건
+
+    pk 목록 대신 색인 검색 서브쿼리로 거르므로 결과 개수 제한이 없습니다.
+    """
+    tokens = query_tokens(text or "")
+    if not tokens:
+        return Q(pk__in=[])
+    return Q(pk__in=get_search_backend().match(tokens).values("article_id"))
+
+
+def search_articles(text, limit=SEARCH_LIMIT):
+    """검색어가 포함된 게시글 pk 목록을 관련도 순으로 상위 limit개 반환합니다."""
+    tokens = query_tokens(text or "")
+    if not tokens:
+        return []
+    with connection.cursor() as cursor:
+        return get_search_backend().search(cursor, tokens, limit)
+
+
+def rank_order(article_ids):
+    """search_articles 결과 순서대로 정렬하는 order_by 식 (나머지는 그 뒤)"""
+    return Case(
+        *[When(pk=pk, then=rank) for rank, pk in enumerate(article_ids)],
+        default=len(article_ids),
+        output_field=IntegerField(),
+    )
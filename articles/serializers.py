@@ -17,7 +17,7 @@ from taggit.models import Tag
 class ArticleSerializer(TaggitSerializer, serializers.ModelSerializer):
     tags = TagListSerializerField(required=False)
     is_author = serializers.SerializerMethodField()
-    likes_count = serializers.SerializerMethodField()
+    likes_count = serializers.IntegerField(source="like_count", read_only=True)
 
     class Meta:
         model = Article
@@ -37,10 +37,7 @@ class ArticleSerializer(TaggitSerializer, serializers.ModelSerializer):
 
     def get_is_author(self, article):
         request = self.context["request"]
-        return article.author == request.user
-
-    def get_likes_count(self, obj):
-        return obj.like.count()
+        return article.author_id == request.user.id
 
 
 class IngredientSerializer(ModelSerializer):
@@ -62,7 +59,7 @@ class CategorySerializer(ModelSerializer):
 
 class CommentSerializer(serializers.ModelSerializer):
     is_author = serializers.SerializerMethodField()
-    likes_count = serializers.SerializerMethodField()
+    likes_count = serializers.IntegerField(source="like_count", read_only=True)
     user = serializers.SerializerMethodField()
     # recomments = serializers.SerializerMethodField()
 
@@ -106,12 +103,9 @@ class CommentSerializer(serializers.ModelSerializer):
     def get_user(self, obj):
         return obj.author.username
 
-    def get_likes_count(self, obj):
-        return obj.like.count()
-
     def get_is_author(self, article):
         request = self.context["request"]
-        return article.author == request.user
+        return article.author_id == request.user.id
 
     # def get_recomments(self, instance):
     #     serializer = self.__class__(instance.recomments, many=True)
@@ -121,7 +115,7 @@ class CommentSerializer(serializers.ModelSerializer):
 
 class RecommentSerializer(serializers.ModelSerializer):
     is_author = serializers.SerializerMethodField()
-    likes_count = serializers.SerializerMethodField()
+    likes_count = serializers.IntegerField(source="like_count", read_only=True)
     user = serializers.SerializerMethodField()
 
     # 댓글 조회 시리얼라이저-직렬화
@@ -167,12 +161,9 @@ class RecommentSerializer(serializers.ModelSerializer):
     def get_user(self, obj):
         return obj.author.username
 
-    def get_likes_count(self, obj):
-        return obj.like.count()
-
     def get_is_author(self, article):
         request = self.context["request"]
-        return article.author == request.user
+        return article.author_id == request.user.id
 
 
 # 레시피 재료 가져오기
@@ -196,8 +187,8 @@ class ArticleDetailSerializer(serializers.ModelSerializer, TaggitSerializer):
     tags = TagListSerializerField()
     is_author = serializers.SerializerMethodField()
     user = serializers.SerializerMethodField()
-    likes_count = serializers.SerializerMethodField()
-    comments_count = serializers.SerializerMethodField()
+    likes_count = serializers.IntegerField(source="like_count", read_only=True)
+    comments_count = serializers.IntegerField(source="comment_count", read_only=True)
     categoryname = serializers.SerializerMethodField()
     recipeingredient_set = RecipeIngredientSerializer(
         many=True
@@ -213,15 +204,9 @@ class ArticleDetailSerializer(serializers.ModelSerializer, TaggitSerializer):
     def get_user(self, obj):
         return obj.author.username
 
-    def get_comments_count(self, obj):
-        return obj.comment_set.count()
-
-    def get_likes_count(self, obj):
-        return obj.like.count()
-
     def get_is_author(self, article):
         request = self.context["request"]
-        return article.author == request.user
+        return article.author_id == request.user.id
 
 
 class ArticleListSerializer(ArticleDetailSerializer):
@@ -289,11 +274,8 @@ class IngredientLinkSerializer(ModelSerializer):
 
 
 class ArticleLikeCountSerializer(serializers.ModelSerializer):
-    likes_count = serializers.SerializerMethodField()
+    likes_count = serializers.IntegerField(source="like_count", read_only=True)
 
     class Meta:
         model = Article
         fields = ("likes_count",)
-
-    def get_likes_count(self, obj):
-        return obj.like.count()
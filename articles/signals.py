@@ -0,0 +1,29 @@
+from django.db import connections
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Article, Ingredient
+from .ingredient_search import ingredient_name_index
+from .search import setup_search_index, update_search_document
+
+
+@receiver(post_save, sender=Article)
+def update_article_search(sender, instance, raw=False, **kwargs):
+    """게시글 저장시 검색 문서 갱신 (색인은 DB가 갱신)"""
+    if not raw:
+        update_search_document(instance)
+
+
+def setup_article_search(sender, using, **kwargs):
+    """migrate 후 DB 종류에 맞는 검색 색인 생성"""
+    setup_search_index(connections[using])
+
+
+@receiver(post_save, sender=Ingredient)
+def add_ingredient_name(sender, instance, created=False, **kwargs):
+    if created:
+        ingredient_name_index.add([instance.ingredient_name])
+
+
+@receiver(post_delete, sender=Ingredient)
+def remove_ingredient_name(sender, instance, **kwargs):
+    ingredient_name_index.remove([instance.ingredient_name])
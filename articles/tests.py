@@ -1,3 +1,733 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
+import threading
+import requests
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import QuerySet
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from articles.coupang import (
+    CoupangManage,
+    SlidingWindowLimiter,
+    parse_price,
+    read_checkpoint,
+    replace_ingredient_links,
+    save_coupang_links_to_ingredients,
+    stale_ingredient_names,
+    update_ingredient_links,
+    write_checkpoint,
+)
+from articles.counters import toggle_with_counter
+from articles.link_refresh import LinkRefreshQueue
+from articles.ingredient_search import IngredientNameIndex, ingredient_name_index
+from articles.models import (
+    Article,
+    ArticleSearch,
+    Category,
+    Comment,
+    Ingredient,
+    IngredientLink,
+    IngredientPrice,
+    RecipeIngredient,
+)
+from articles.prices import price_summary
+from articles.search import search_articles, search_filter
+from users.models import Fridge, User
 
-# Create your tests here.
+
+class ArticleBaseTestCase(APITestCase):
+    """게시글 기능 테스트 준비
+
+    Attribute:
+        users: 유저 3명
+        article: users[0]이 작성한 게시글
+        comment: users[1]이 작성한 댓글
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [
+            User.objects.create_user(
+                username=f"testuser{i}",
+                email=f"testuser{i}@gmail.com",
+                password="xptmxm111!",
+            )
+            for i in range(3)
+        ]
+        cls.category = Category.objects.create(name="한식", info="한식")
+        cls.article = Article.objects.create(
+            author=cls.users[0], category=cls.category, title="김치찌개"
+        )
+        cls.comment = Comment.objects.create(
+            author=cls.users[1], article=cls.article, comment="맛있어요"
+        )
+
+
+class CounterTestCase(ArticleBaseTestCase):
+    def test_article_like_toggle(self):
+        """정상: 게시글 좋아요 토글시 like_count 갱신"""
+        url = f"/articles/{self.article.pk}/like/"
+        for user in self.users[1:]:
+            self.client.force_authenticate(user)
+            response = self.client.post(url)
+            self.assertTrue(response.data["flag"])
+        self.assertEqual(response.data["result"]["likes_count"], 2)
+        response = self.client.post(url)
+        self.assertFalse(response.data["flag"])
+        self.assertEqual(response.data["result"]["likes_count"], 1)
+
+    def test_bookmark_and_comment_counts(self):
+        """정상: 북마크 토글, 댓글 작성/삭제시 카운터 갱신"""
+        self.client.force_authenticate(self.users[1])
+        self.client.post(f"/articles/{self.article.pk}/bookmark/")
+        response = self.client.post(
+            f"/articles/{self.article.pk}/comment/", {"comment": "또 먹고싶어요"}
+        )
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.bookmark_count, 1)
+        self.assertEqual(self.article.comment_count, 1)
+        self.client.delete(
+            f"/articles/{self.article.pk}/comment/{response.data['id']}/"
+        )
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.comment_count, 0)
+
+    def test_comment_like_toggle(self):
+        """정상: 댓글 좋아요 토글시 like_count 갱신"""
+        self.client.force_authenticate(self.users[0])
+        response = self.client.post(f"/articles/comment/{self.comment.pk}/like/")
+        self.assertEqual(response.data, "like")
+        self.comment.refresh_from_db()
+        self.assertEqual(self.comment.like_count, 1)
+
+    def test_toggle_off_uncounted(self):
+        """정상: 카운터 컬럼 전에 있던(세지 않은) 좋아요 취소/댓글 삭제도 0에서 멈춤"""
+        Article.like.through.objects.create(article=self.article, user=self.users[1])
+        self.client.force_authenticate(self.users[1])
+        response = self.client.post(f"/articles/{self.article.pk}/like/")
+        self.assertFalse(response.data["flag"])
+        self.assertEqual(response.data["result"]["likes_count"], 0)
+        response = self.client.delete(
+            f"/articles/{self.article.pk}/comment/{self.comment.pk}/"
+        )
+        self.assertEqual(response.status_code, 204)
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.comment_count, 0)
+
+    def test_toggle_locks_row(self):
+        """정상: 존재 확인 전에 대상 행을 select_for_update로 잠금"""
+        with mock.patch.object(
+            QuerySet,
+            "select_for_update",
+            autospec=True,
+            side_effect=QuerySet.select_for_update,
+        ) as lock:
+            self.assertTrue(
+                toggle_with_counter(self.comment, "like", "like_count", self.users[0])
+            )
+        self.assertEqual(lock.call_args[0][0].model, Comment)
+        self.assertFalse(
+            toggle_with_counter(self.comment, "like", "like_count", self.users[0])
+        )
+        self.comment.refresh_from_db()
+        self.assertEqual(self.comment.like_count, 0)
+
+    def test_reconcile_counters(self):
+        """정상: 뷰를 거치지 않은 변경을 reconcile_counters로 보정"""
+        self.article.like.add(self.users[1], self.users[2])
+        self.comment.like.add(self.users[0])
+        call_command("reconcile_counters", stdout=StringIO())
+        self.article.refresh_from_db()
+        self.comment.refresh_from_db()
+        self.assertEqual(self.article.like_count, 2)
+        self.assertEqual(self.article.comment_count, 1)
+        self.assertEqual(self.article.bookmark_count, 0)
+        self.assertEqual(self.comment.like_count, 1)
+
+    def test_order_by_like_count(self):
+        """정상: order=1이면 좋아요 수 순으로 정렬"""
+        popular = Article.objects.create(
+            author=self.users[1], category=self.category, title="된장찌개"
+        )
+        Article.objects.filter(pk=popular.pk).update(like_count=3)
+        response = self.client.get("/articles/", {"order": "1"})
+        self.assertEqual(response.data["results"][0]["id"], popular.pk)
+
+
+class ArticleListQueryTestCase(ArticleBaseTestCase):
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_article_list_queries(self):
+        """정상: 게시글 수와 관계없이 한 페이지의 쿼리 수는 일정"""
+        self.client.force_authenticate(self.users[1])
+        one = self.count_queries("/articles/")
+        for i in range(5):
+            Article.objects.create(
+                author=self.users[i % 3], category=self.category, title=f"title{i}"
+            )
+        self.assertEqual(self.count_queries("/articles/"), one)
+        self.assertEqual(self.count_queries("/articles/?order=1"), one)
+
+    def test_comment_list_queries(self):
+        """정상: 댓글 수와 관계없이 한 페이지의 쿼리 수는 일정"""
+        url = f"/articles/{self.article.pk}/comment/"
+        one = self.count_queries(url)
+        for user in self.users:
+            comment = Comment.objects.create(
+                author=user, article=self.article, comment="맛있어요"
+            )
+            comment.like.add(*self.users)
+        self.assertEqual(self.count_queries(url), one)
+
+
+class SearchTestCase(ArticleBaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.stew = Article.objects.create(
+            author=cls.users[1],
+            category=cls.category,
+            title="된장찌개",
+            content="찌개에 두부를 넣어요",
+            recipe="<p>된장을 풀고 두부를 넣는다</p>",
+        )
+        cls.tofu = Article.objects.create(
+            author=cls.users[1], category=cls.category, title="두부조림", content="반찬"
+        )
+
+    def test_search_articles(self):
+        """정상: 단어 중간의 검색어도 찾고, 관련도순 정렬"""
+        self.assertCountEqual(search_articles("찌개"), [self.stew.pk, self.article.pk])
+        self.assertEqual(search_articles("두부"), [self.tofu.pk, self.stew.pk])
+        self.assertEqual(search_articles("풀고"), [self.stew.pk])
+        self.assertEqual(search_articles("피자"), [])
+        self.assertEqual(search_articles(" "), [])
+
+    def test_index_follows_save_and_delete(self):
+        """정상: 게시글 수정/삭제시 색인 갱신"""
+        self.tofu.title = "계란말이"
+        self.tofu.save()
+        self.assertEqual(search_articles("두부"), [self.stew.pk])
+        self.assertEqual(search_articles("계란"), [self.tofu.pk])
+        self.stew.delete()
+        self.assertEqual(search_articles("두부"), [])
+        self.assertFalse(ArticleSearch.objects.filter(pk=self.stew.pk).exists())
+
+    def test_search_view(self):
+        """정상: 제목/내용 검색, order=2는 관련도순"""
+        response = self.client.get("/articles/?search=1&selector=두부&order=2")
+        self.assertEqual(
+            [article["id"] for article in response.data["results"]],
+            [self.tofu.pk, self.stew.pk],
+        )
+        response = self.client.get("/articles/?search=1&selector=조림")
+        self.assertEqual(
+            [article["id"] for article in response.data["results"]], [self.tofu.pk]
+        )
+
+    def test_search_not_limited(self):
+        """정상: 관련도 순위 개수 제한과 관계없이 모든 결과를 거르고, 순위 밖은 최신순"""
+        self.assertCountEqual(
+            Article.objects.filter(search_filter("두부")).values_list("pk", flat=True),
+            [self.tofu.pk, self.stew.pk],
+        )
+        self.assertFalse(Article.objects.filter(search_filter(" ")).exists())
+        with mock.patch("articles.views.search_articles", return_value=[self.stew.pk]):
+            response = self.client.get("/articles/?search=1&selector=찌개&order=2")
+            self.assertEqual(
+                [article["id"] for article in response.data["results"]],
+                [self.stew.pk, self.article.pk],
+            )
+            response = self.client.get("/articles/?search=1&selector=두부&order=2")
+            self.assertEqual(
+                [article["id"] for article in response.data["results"]],
+                [self.stew.pk, self.tofu.pk],
+            )
+
+    def test_rebuild_search_index(self):
+        """정상: 관리 명령으로 검색 문서 재생성"""
+        ArticleSearch.objects.all().delete()
+        self.assertEqual(search_articles("두부"), [])
+        call_command("rebuild_search_index", stdout=StringIO())
+        self.assertEqual(search_articles("두부"), [self.tofu.pk, self.stew.pk])
+
+
+class IngredientSearchTestCase(ArticleBaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for name in ["김치", "배추김치", "감자", "고구마", "Tofu"]:
+            Ingredient.objects.create(ingredient_name=name)
+        RecipeIngredient.objects.create(
+            article=cls.article, ingredient_id="배추김치", ingredient_quantity=1
+        )
+
+    def setUp(self):
+        ingredient_name_index.reset()
+        self.addCleanup(ingredient_name_index.reset)
+
+    def test_lookup(self):
+        """정상: 부분 일치 검색, 대소문자 무시"""
+        index = IngredientNameIndex()
+        self.assertEqual(index.lookup("김치"), {"김치", "배추김치"})
+        self.assertEqual(index.lookup("추김"), {"배추김치"})
+        self.assertEqual(index.lookup("배추김치"), {"배추김치"})
+        self.assertEqual(index.lookup("구"), {"고구마"})
+        self.assertEqual(index.lookup("tof"), {"Tofu"})
+        self.assertEqual(index.lookup("김치찌개"), set())
+        self.assertEqual(index.search(["감자", "", "고구"]), {"감자", "고구마"})
+
+    def test_index_follows_changes(self):
+        """정상: 재료 생성/삭제시 색인 갱신"""
+        ingredient_name_index.lookup("김치")
+        Ingredient.objects.create(ingredient_name="열무김치")
+        Ingredient.objects.filter(ingredient_name="김치").delete()
+        self.assertEqual(ingredient_name_index.lookup("김치"), {"배추김치", "열무김치"})
+
+    def test_search_view(self):
+        """정상: 재료 이름 일부로 게시글 검색"""
+        response = self.client.get("/articles/?search=2&selector=추김,고구마")
+        self.assertEqual(
+            [article["id"] for article in response.data["results"]], [self.article.pk]
+        )
+        response = self.client.get("/articles/?search=2&selector=없는재료")
+        self.assertEqual(response.data["results"], [])
+
+
+class KeysetPaginationTestCase(ArticleBaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for i in range(9):
+            Article.objects.create(
+                author=cls.users[i % 3], category=cls.category, title=f"title{i}"
+            )
+        # 좋아요 수가 같은 게시글이 여러 개 있도록 합니다.
+        for i, article in enumerate(Article.objects.order_by("pk")):
+            Article.objects.filter(pk=article.pk).update(like_count=i % 3)
+
+    def walk(self, url):
+        """next를 따라가며 모든 페이지의 게시글 id를 모읍니다."""
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("count", response.data)
+            ids += [article["id"] for article in response.data["results"]]
+            url = response.data["next"]
+        return ids
+
+    def test_cursor_pages(self):
+        """정상: 커서로 모든 게시글을 중복/누락 없이 정렬 순서대로 조회"""
+        expected = list(
+            Article.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+        self.assertEqual(self.walk("/articles/"), expected)
+        expected = list(
+            Article.objects.order_by("-like_count", "-id").values_list("id", flat=True)
+        )
+        self.assertEqual(self.walk("/articles/?order=1"), expected)
+
+    def test_no_count_query(self):
+        """정상: 커서 모드는 COUNT 쿼리 없음, page를 주면 페이지 번호 방식"""
+        with CaptureQueriesContext(connection) as context:
+            self.client.get("/articles/")
+        self.assertFalse(
+            [q for q in context.captured_queries if "COUNT(*)" in q["sql"]]
+        )
+        response = self.client.get("/articles/?page=2")
+        self.assertEqual(response.data["count"], 10)
+        self.assertEqual(len(response.data["results"]), 4)
+
+    def test_invalid_cursor(self):
+        """예외: 잘못된 커서는 404"""
+        response = self.client.get("/articles/?cursor=invalid")
+        self.assertEqual(response.status_code, 404)
+
+
+class LinkRefreshTestCase(ArticleBaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for name in ("김치", "두부"):
+            Ingredient.objects.create(ingredient_name=name)
+            RecipeIngredient.objects.create(
+                article=cls.article, ingredient_id=name, ingredient_quantity=1
+            )
+        IngredientLink.objects.create(
+            ingredient_id="김치", link="https://example.com/kimchi", price="1000"
+        )
+
+    def test_queue_deduplicates_in_flight(self):
+        """정상: 갱신중인 재료는 다시 넣지 않고, 끝난 재료는 잠시 넣지 않음"""
+        release = threading.Event()
+        calls = []
+        queue = LinkRefreshQueue(
+            refresh=lambda name: (calls.append(name), release.wait(5))
+        )
+        self.assertEqual(queue.enqueue(["김치", "두부"]), {"김치", "두부"})
+        self.assertEqual(queue.enqueue(["김치"]), {"김치"})
+        release.set()
+        queue._executor.shutdown(wait=True)
+        self.assertCountEqual(calls, ["김치", "두부"])
+        self.assertFalse(queue.is_refreshing("김치"))
+        self.assertEqual(queue.enqueue(["김치"]), set())
+
+    def test_refresh_failure_logged(self):
+        """에러: 갱신중 예외는 traceback과 함께 로그로 남고, 다음 요청을 막지 않음"""
+
+        def refresh(name):
+            raise ValueError("쿠팡 응답 오류")
+
+        queue = LinkRefreshQueue(refresh=refresh)
+        with self.assertLogs("articles.link_refresh", "ERROR") as logs:
+            queue.enqueue(["김치"])
+            queue._executor.shutdown(wait=True)
+        self.assertIn("김치 링크 갱신 실패", logs.output[0])
+        self.assertIsNotNone(logs.records[0].exc_info)
+        self.assertFalse(queue.is_refreshing("김치"))
+
+    def test_link_view_returns_cached_links(self):
+        """정상: 캐시된 링크를 바로 반환하고, 링크가 없는 재료는 갱신 예약"""
+        with mock.patch(
+            "articles.views.link_refresh_queue.enqueue", return_value={"두부"}
+        ) as enqueue:
+            response = self.client.get(f"/articles/{self.article.pk}/order/")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data["refreshing"])
+        self.assertEqual(
+            [link["link"] for link in response.data["results"]],
+            ["https://example.com/kimchi"],
+        )
+        self.assertEqual(enqueue.call_args[0][0], ["두부"])
+
+
+class StubCoupangHandler(BaseHTTPRequestHandler):
+    """쿠팡 API stub. 처음 fail_first번은 503, 이후 상품 하나를 반환"""
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(self.path)
+        if len(server.requests) <= server.fail_first:
+            self.send_response(503)
+            self.end_headers()
+            return
+        body = json.dumps(
+            {
+                "data": {
+                    "productData": [
+                        {
+                            "productUrl": "https://example.com/p/1",
+                            "productImage": "https://example.com/p/1.jpg",
+                            "productPrice": 1200,
+                            "productId": 77,
+                        }
+                    ]
+                }
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@mock.patch("articles.coupang.SECRET_KEY", "secret")
+class CoupangClientTestCase(APITestCase):
+    def start_server(self, fail_first=0):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), StubCoupangHandler)
+        server.requests = []
+        server.fail_first = fail_first
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def test_retry_and_parse(self):
+        """정상: 503은 재시도하고, 응답 JSON을 상품 목록으로 변환"""
+        server = self.start_server(fail_first=1)
+        client = CoupangManage(
+            domain=f"http://127.0.0.1:{server.server_port}",
+            limiter=SlidingWindowLimiter(10, 60, name="test"),
+            backoff=0,
+        )
+        products = client.get_products_by_keyword("감자", 1)
+        self.assertEqual(len(server.requests), 2)
+        self.assertIn("keyword=%EA%B0%90%EC%9E%90", server.requests[0])
+        self.assertEqual(
+            products,
+            [
+                {
+                    "product_url": "https://example.com/p/1",
+                    "product_image_url": "https://example.com/p/1.jpg",
+                    "product_price": 1200,
+                    "product_id": "77",
+                }
+            ],
+        )
+
+    def test_sliding_window_limiter(self):
+        """정상: 어느 period초 구간에서도 max_calls번을 넘지 않음"""
+        now = [0.0]
+        limiter = SlidingWindowLimiter(
+            max_calls=50, period=60, name="test", clock=lambda: now[0]
+        )
+        calls = []
+        while now[0] < 300:
+            wait = limiter.try_acquire()
+            if wait:
+                now[0] += wait
+            else:
+                calls.append(now[0])
+                now[0] += 0.1
+        self.assertGreater(len(calls), 200)
+        for index, start in enumerate(calls):
+            in_window = [t for t in calls[index:] if t < start + 60]
+            self.assertLessEqual(len(in_window), 50)
+        self.assertEqual(calls[50], 60)
+
+    def test_limiter_shared_between_processes(self):
+        """정상: 같은 이름의 limiter(다른 프로세스)는 한도를 함께 씀"""
+        now = [0.0]
+        workers = [
+            SlidingWindowLimiter(
+                max_calls=3, period=60, name="shared", clock=lambda: now[0]
+            )
+            for _ in range(2)
+        ]
+        self.assertEqual([workers[i % 2].try_acquire() for i in range(3)], [0, 0, 0])
+        self.assertEqual(workers[0].try_acquire(), 60)
+        self.assertEqual(workers[1].try_acquire(), 60)
+        now[0] = 60
+        self.assertEqual(workers[1].try_acquire(), 0)
+
+
+def make_products(*urls):
+    return [
+        {
+            "product_url": url,
+            "product_image_url": url + ".jpg",
+            "product_price": 1000,
+        }
+        for url in urls
+    ]
+
+
+class IngredientLinkUpsertTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for name in ("감자", "양파"):
+            Ingredient.objects.create(ingredient_name=name)
+            IngredientLink.objects.create(
+                ingredient_id=name, link=f"https://example.com/old/{name}"
+            )
+        Ingredient.objects.filter(pk__in=["감자", "양파"]).update(updated_at=None)
+
+    def test_replace_in_one_transaction(self):
+        """정상: 새 상품을 받은 재료는 링크 교체, 못 받은 재료는 최근 링크 유지"""
+        with CaptureQueriesContext(connection) as context:
+            names = replace_ingredient_links(
+                {
+                    "감자": make_products(
+                        "https://example.com/1", "https://example.com/2"
+                    ),
+                    "양파": [],
+                    "없는재료": make_products("https://example.com/3"),
+                }
+            )
+        self.assertCountEqual(names, ["감자", "양파"])
+        # 재료 조회 후 트랜잭션 안에서 삭제, 생성, 갱신 한 번씩
+        self.assertLessEqual(len(context.captured_queries), 7)
+        self.assertEqual(
+            sorted(IngredientLink.objects.values_list("link", flat=True)),
+            [
+                "https://example.com/1",
+                "https://example.com/2",
+                "https://example.com/old/양파",
+            ],
+        )
+        self.assertFalse(Ingredient.objects.filter(updated_at__isnull=True).exists())
+
+    def test_multi_ingredient_refresh(self):
+        """정상: 여러 재료를 검색한 뒤 한 번에 저장, 검색 실패한 재료는 건너뜀"""
+
+        def search(keyword, limit):
+            if keyword == "양파":
+                raise requests.ConnectionError("down")
+            return make_products(f"https://example.com/{keyword}")
+
+        with mock.patch.object(
+            CoupangManage, "get_products_by_keyword", side_effect=search
+        ), self.assertLogs("articles.coupang", "WARNING") as logs:
+            names = save_coupang_links_to_ingredients(["감자", "양파"])
+        self.assertEqual(names, ["감자"])
+        self.assertIn("양파 상품 검색 실패: down", logs.output[0])
+        self.assertEqual(
+            list(
+                IngredientLink.objects.filter(ingredient_id="감자").values_list(
+                    "link", flat=True
+                )
+            ),
+            ["https://example.com/감자"],
+        )
+        self.assertTrue(IngredientLink.objects.filter(ingredient_id="양파").exists())
+
+
+class NightlyLinkRefreshTestCase(ArticleBaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for name in ("감자", "양파", "마늘", "두부"):
+            Ingredient.objects.create(ingredient_name=name)
+        for name in ("양파", "마늘"):
+            RecipeIngredient.objects.create(
+                article=cls.article, ingredient_id=name, ingredient_quantity=1
+            )
+        Fridge.objects.create(user=cls.users[0], ingredient_id="마늘")
+        Ingredient.objects.update(updated_at=None)
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.checkpoint = os.path.join(tmp_dir.name, "checkpoint.json")
+        settings_override = override_settings(
+            INGREDIENT_LINK_CHECKPOINT=self.checkpoint
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_priority_order(self):
+        """정상: 레시피/냉장고에서 많이 쓰이는 재료부터 갱신"""
+        self.assertEqual(
+            stale_ingredient_names(timezone.now()), ["마늘", "양파", "감자", "두부"]
+        )
+
+    def test_update_in_batches(self):
+        """정상: 배치마다 저장하고 끝나면 체크포인트를 완료로 기록"""
+        with mock.patch.object(
+            CoupangManage,
+            "get_products_by_keyword",
+            side_effect=lambda keyword, limit: make_products(
+                f"https://example.com/{keyword}"
+            ),
+        ):
+            self.assertEqual(update_ingredient_links(batch_size=3), 4)
+        self.assertEqual(IngredientLink.objects.count(), 4)
+        self.assertFalse(Ingredient.objects.filter(updated_at__isnull=True).exists())
+        checkpoint = read_checkpoint()
+        self.assertTrue(checkpoint["finished"])
+        self.assertEqual(checkpoint["done"], 4)
+
+    def test_resume_from_checkpoint(self):
+        """정상: 중간에 끝난 실행은 같은 cutoff로 남은 재료만 이어서 갱신"""
+        cutoff = timezone.now()
+        write_checkpoint(cutoff, 2, finished=False)
+        Ingredient.objects.filter(pk__in=["마늘", "양파"]).update(
+            updated_at=cutoff + timezone.timedelta(seconds=1)
+        )
+        keywords = []
+
+        def search(keyword, limit):
+            keywords.append(keyword)
+            return make_products(f"https://example.com/{keyword}")
+
+        with mock.patch.object(
+            CoupangManage, "get_products_by_keyword", side_effect=search
+        ):
+            self.assertEqual(update_ingredient_links(), 4)
+        self.assertCountEqual(keywords, ["감자", "두부"])
+        self.assertTrue(read_checkpoint()["finished"])
+
+
+class IngredientPriceTestCase(ArticleBaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for name in ("감자", "양파"):
+            Ingredient.objects.create(ingredient_name=name)
+            RecipeIngredient.objects.create(
+                article=cls.article, ingredient_id=name, ingredient_quantity=1
+            )
+        Fridge.objects.create(user=cls.users[0], ingredient_id="양파")
+        today = timezone.localdate()
+        for days_ago, prices in ((40, (100, 200)), (2, (3000, 5000)), (0, (2000,))):
+            for product, price in enumerate(prices):
+                IngredientPrice.objects.create(
+                    ingredient_id="감자",
+                    product_id=str(product),
+                    price=price,
+                    day=today - timezone.timedelta(days=days_ago),
+                )
+        IngredientPrice.objects.create(
+            ingredient_id="양파", product_id="0", price=900, day=today
+        )
+
+    def test_parse_price(self):
+        self.assertEqual(parse_price(12900), 12900)
+        self.assertEqual(parse_price("12,900"), 12900)
+        self.assertIsNone(parse_price("품절"))
+        self.assertIsNone(parse_price(None))
+
+    def test_record_one_row_per_day(self):
+        """정상: 같은 날 다시 검색하면 상품별 가격 한 행을 최신 가격으로 갱신"""
+        for price in (1500, 1300):
+            products = [
+                {
+                    "product_url": "https://example.com/1",
+                    "product_image_url": "https://example.com/1.jpg",
+                    "product_price": price,
+                    "product_id": "new",
+                }
+            ]
+            replace_ingredient_links({"감자": products, "양파": []})
+        self.assertEqual(
+            list(
+                IngredientPrice.objects.filter(product_id="new").values_list(
+                    "ingredient_id", "price", "day"
+                )
+            ),
+            [("감자", 1300, timezone.localdate())],
+        )
+
+    def test_price_summary(self):
+        """정상: 기간 안의 기록만으로 최저가/평균가/추이 계산"""
+        today = timezone.localdate()
+        summary = price_summary(["감자", "양파"], days=30)
+        self.assertEqual([row["ingredient"] for row in summary], ["양파", "감자"])
+        potato = summary[1]
+        self.assertEqual((potato["min"], potato["avg"]), (2000, 3333))
+        self.assertEqual(potato["change"], -1000)
+        self.assertEqual(
+            potato["trend"],
+            [
+                {"day": today - timezone.timedelta(days=2), "min": 3000, "avg": 4000},
+                {"day": today, "min": 2000, "avg": 2000},
+            ],
+        )
+
+    def test_missing_ingredient_prices(self):
+        """정상: 냉장고에 없는 재료의 가격만 반환, 잘못된 기간은 400"""
+        self.client.force_authenticate(self.users[0])
+        url = f"/articles/{self.article.pk}/prices/"
+        response = self.client.get(url, {"days": 3})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [row["ingredient"] for row in response.data["results"]], ["감자"]
+        )
+        self.assertEqual(self.client.get(url, {"days": 0}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"days": "x"}).status_code, 400)
@@ -63,6 +63,11 @@ urlpatterns = [
         views.LinkPlusView.as_view(),
         name="order",
     ),
+    path(  # 없는 재료 가격 추이
+        "<int:article_id>/prices/",
+        views.IngredientPriceView.as_view(),
+        name="ingredient_prices",
+    ),
     path(
         "<int:article_id>/like/",
         views.ArticleLikeView.as_view(),
@@ -35,9 +35,14 @@ from articles.serializers import (
 )
 from django.conf import settings
 import requests
+from django.db import transaction
 from django.db.models import Q
 from taggit.models import Tag
-from articles.coupang import save_coupang_links_to_ingredient_links
+from articles.link_refresh import link_refresh_queue, stale_ingredients
+from articles.prices import PRICE_MAX_WINDOW_DAYS, PRICE_WINDOW_DAYS, price_summary
+from articles.counters import toggle_with_counter, add_comment_count
+from articles.search import rank_order, search_articles, search_filter
+from articles.ingredient_search import ingredient_name_index
 from datetime import datetime, timedelta
 from django.utils import timezone
 
@@ -57,9 +62,9 @@ class ArticleView(generics.ListCreateAPIView):
 
     def search_title_content(self):
         selector = self.request.GET.get("selector")
-        q = Q(title__icontains=selector)
-        q.add(Q(content__icontains=selector), q.OR)
-        q.add(Q(recipe__icontains=selector), q.OR)
+        # 제목/내용/레시피 n-gram 색인 검색 (articles/search.py)
+        self.search_text = selector
+        q = search_filter(selector)
 
         if self.request.GET.get("recipe"):
             q2 = Q(recipe__isnull=False)
@@ -69,13 +74,13 @@ class ArticleView(generics.ListCreateAPIView):
 
     def search_ingredient(self):
         selector = self.request.GET.get("selector")
-        ingredient_q = Q()
-        for ingredient_ in selector.split(","):
-            if ingredient_ == "":
-                continue
-            ingredient_q.add(Q(ingredient_name__icontains=ingredient_), ingredient_q.OR)
-        ingredients = Ingredient.objects.filter(ingredient_q)
-        q = Q(recipeingredient__ingredient__in=ingredients)
+        # 재료 이름 n-gram 색인으로 부분 일치하는 재료를 찾습니다. (articles/ingredient_search.py)
+        names = ingredient_name_index.search(selector.split(","))
+        q = Q(
+            id__in=RecipeIngredient.objects.filter(ingredient_id__in=names).values(
+                "article_id"
+            )
+        )
 
         return q
 
@@ -113,6 +118,7 @@ class ArticleView(generics.ListCreateAPIView):
 
     def get_queryset(self):
         search_key = self.request.GET.get("search", None)
+        self.search_text = None
         q = Q()
         if search_key:
             q = self.search(search_key)
@@ -127,17 +133,24 @@ class ArticleView(generics.ListCreateAPIView):
         order = self.request.GET.get("order")
         if order == "1":
             queryset = (
-                Article.objects.annotate(like_count=Count("like", distinct=True))
+                Article.objects.select_related("author")
                 .annotate(counts=Count("recipeingredient", distinct=True))
                 .filter(q)
                 .order_by("-like_count")
             )
+        elif order == "2" and self.search_text:
+            # 검색 관련도순 (상위 SEARCH_LIMIT개만 순위를 매기고 나머지는 최신순)
+            queryset = (
+                Article.objects.select_related("author")
+                .annotate(counts=Count("recipeingredient", distinct=True))
+                .filter(q)
+                .order_by(rank_order(search_articles(self.search_text)), "-created_at")
+            )
         else:
             Article.objects.annotate(counts=Count("recipeingredient"))
             queryset = (
-                Article.objects.annotate(
-                    counts=Count("recipeingredient", distinct=True)
-                )
+                Article.objects.select_related("author")
+                .annotate(counts=Count("recipeingredient", distinct=True))
                 .filter(q)
                 .order_by("-created_at")
             )
@@ -181,7 +194,9 @@ class IngredientCreateView(APIView):
 # 게시글 가져오기, 수정, 삭제
 class ArticleDetailView(APIView):
     def get(self, request, article_id):
-        article = get_object_or_404(Article, id=article_id)
+        article = get_object_or_404(
+            Article.objects.select_related("author", "category"), id=article_id
+        )
         serializer = ArticleDetailSerializer(
             article,
             context={"request": request},
@@ -246,7 +261,11 @@ class CommentView(generics.ListCreateAPIView):
     queryset = None
 
     def get_queryset(self):
-        queryset = Comment.objects.filter(article_id=self.article_id)
+        queryset = (
+            Comment.objects.filter(article_id=self.article_id)
+            .select_related("author")
+            .prefetch_related("like")
+        )
         order = self.request.GET.get("order", None)
         if order == "1":
             return queryset.order_by("-like_count")
@@ -263,7 +282,9 @@ class CommentView(generics.ListCreateAPIView):
             data=request.data, context={"request": request}
         )
         if serializer.is_valid():
-            serializer.save(author=request.user, article_id=article_id)
+            with transaction.atomic():
+                serializer.save(author=request.user, article_id=article_id)
+                add_comment_count(article_id, 1)
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -286,7 +307,9 @@ class CommentDetailView(APIView):
     def delete(self, request, article_id, comment_id):
         comment = get_object_or_404(Comment, id=comment_id)
         if request.user == comment.author:
-            comment.delete()
+            with transaction.atomic():
+                comment.delete()
+                add_comment_count(comment.article_id, -1)
             return Response("댓글이 삭제되었습니다", status=status.HTTP_204_NO_CONTENT)
         return Response("본인이 작성한 댓글만 삭제할수 있습니다", status=status.HTTP_403_FORBIDDEN)
 
@@ -298,8 +321,12 @@ class RecommentView(generics.ListCreateAPIView):
     queryset = None
 
     def get_queryset(self):
-        queryset = Recomment.objects.filter(
-            article_id=self.article_id, comment_id=self.comment_id
+        queryset = (
+            Recomment.objects.filter(
+                article_id=self.article_id, comment_id=self.comment_id
+            )
+            .select_related("author")
+            .prefetch_related("like")
         )
         order = self.request.GET.get("order", None)
         if order == "1":
@@ -410,16 +437,9 @@ class ArticleLikeView(APIView):
     def post(self, request, article_id):
         """게시글 좋아요 누르기"""
         article = get_object_or_404(Article, id=article_id)
-        if request.user in article.like.all():
-            article.like.remove(request.user)
-            article.save()
-            serializer = ArticleLikeCountSerializer(article)
-            flag = False
-
-        else:
-            article.like.add(request.user)
-            serializer = ArticleLikeCountSerializer(article)
-            flag = True
+        flag = toggle_with_counter(article, "like", "like_count", request.user)
+        article.refresh_from_db(fields=["like_count"])
+        serializer = ArticleLikeCountSerializer(article)
         return Response(
             {"flag": flag, "result": serializer.data},
             status=status.HTTP_200_OK,
@@ -432,12 +452,10 @@ class CommentLikeView(APIView):
     def post(self, request, comment_id):
         """댓글 좋아요 누르기"""
         comment = get_object_or_404(Comment, id=comment_id)
-        if request.user in comment.like.all():
-            comment.like.remove(request.user)
-            return Response("dislike", status=status.HTTP_200_OK)
-        else:
-            comment.like.add(request.user)
+        if toggle_with_counter(comment, "like", "like_count", request.user):
             return Response("like", status=status.HTTP_200_OK)
+        else:
+            return Response("dislike", status=status.HTTP_200_OK)
 
 
 class ReCommentLikeView(APIView):
@@ -446,12 +464,10 @@ class ReCommentLikeView(APIView):
     def post(self, request, recomment_id):
         """댓글 좋아요 누르기"""
         recomment = get_object_or_404(Recomment, id=recomment_id)
-        if request.user in recomment.like.all():
-            recomment.like.remove(request.user)
-            return Response("dislike", status=status.HTTP_200_OK)
-        else:
-            recomment.like.add(request.user)
+        if toggle_with_counter(recomment, "like", "like_count", request.user):
             return Response("like", status=status.HTTP_200_OK)
+        else:
+            return Response("dislike", status=status.HTTP_200_OK)
 
 
 class BookmarkView(APIView):
@@ -459,12 +475,10 @@ class BookmarkView(APIView):
 
     def post(self, request, article_id):
         article = get_object_or_404(Article, id=article_id)
-        if request.user in article.bookmark.all():
-            article.bookmark.remove(request.user)
-            return Response("unbookmark", status=status.HTTP_200_OK)
-        else:
-            article.bookmark.add(request.user)
+        if toggle_with_counter(article, "bookmark", "bookmark_count", request.user):
             return Response("bookmark", status=status.HTTP_200_OK)
+        else:
+            return Response("unbookmark", status=status.HTTP_200_OK)
 
 
 class RecipeIngredientView(APIView):
@@ -506,23 +520,30 @@ class RecipeIngredientDetailView(APIView):
         )
 
 
+def get_missing_ingredients(request, article_id):
+    """게시글 레시피 재료 중 로그인한 사용자의 냉장고에 없는 재료"""
+    # article_id와 연결된 RecipeIngredient 조회
+    recipe_ingredients = RecipeIngredient.objects.filter(
+        article_id=article_id
+    ).values_list("ingredient", flat=True)
+    # 로그인된 사용자의 Fridge 조회
+    if not request.user.is_anonymous:
+        user_fridge_ingredients = Fridge.objects.filter(user=request.user).values_list(
+            "ingredient", flat=True
+        )
+        # 사용자의 Fridge에 없는 Ingredient 찾기
+        return set(recipe_ingredients) - set(user_fridge_ingredients)
+    return set(recipe_ingredients)
+
+
 class LinkPlusView(APIView):
     # permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, article_id):
-        # article_id와 연결된 RecipeIngredient 조회
-        recipe_ingredients = RecipeIngredient.objects.filter(
-            article_id=article_id
-        ).values_list("ingredient", flat=True)
-        # 로그인된 사용자의 Fridge 조회
-        if not request.user.is_anonymous:
-            user_fridge_ingredients = Fridge.objects.filter(
-                user=request.user
-            ).values_list("ingredient", flat=True)
-            # 사용자의 Fridge에 없는 Ingredient 찾기
-            missing_ingredients = set(recipe_ingredients) - set(user_fridge_ingredients)
-        else:
-            missing_ingredients = set(recipe_ingredients)
+        missing_ingredients = get_missing_ingredients(request, article_id)
+
+        # 링크가 없거나 오래된 재료는 백그라운드에서 갱신 (articles/link_refresh.py)
+        refreshing = link_refresh_queue.enqueue(stale_ingredients(missing_ingredients))
 
         # 없는 Ingredient와 연결된 IngredientLink 조회
         # column_name+__in : 리스트 안에 지정한 문자열들 중에 하나라도 포함된 데이터를 찾을 때 사용
@@ -530,29 +551,33 @@ class LinkPlusView(APIView):
             ingredient__in=missing_ingredients
         )
 
-        # 현재 시간과 5일 전 시간 구하기
-        now = timezone.now()
-        five_days_ago = now - timedelta(days=5)
-
-        # 존재하지 않는 IngredientLink 인스턴스 생성 및 저장
-        for ingredient in missing_ingredients:
-            ingredient_links = IngredientLink.objects.filter(ingredient=ingredient)
-            if not ingredient_links.exists():
-                save_coupang_links_to_ingredient_links(ingredient)
-            else:
-                # link가 등록된 재료라도 `updated_at`이 5일 이상 지났다면 최신화하기
-                existing_link = ingredient_links.first()
-                if (
-                    existing_link.ingredient.updated_at is None
-                    or existing_link.ingredient.updated_at <= five_days_ago
-                ):
-                    save_coupang_links_to_ingredient_links(ingredient)
-
-        # 다시 IngredientLink를 조회
-        ingredient_links = IngredientLink.objects.filter(
-            ingredient__in=missing_ingredients
+        # JSON 형태로 반환, 갱신중인 재료가 있으면 refreshing=True
+        serialized_links = IngredientLinkSerializer(ingredient_links, many=True)
+        return Response(
+            {"results": serialized_links.data, "refreshing": bool(refreshing)},
+            status=status.HTTP_200_OK,
         )
 
-        # JSON 형태로 반환
-        serialized_links = IngredientLinkSerializer(ingredient_links, many=True)
-        return Response(serialized_links.data, status=status.HTTP_200_OK)
+
+class IngredientPriceView(APIView):
+    def get(self, request, article_id):
+        """없는 재료의 최근 가격(최저가/평균가/추이)을 최저가 순으로 반환합니다.
+
+        ?days= 조회 기간(일), 기본 30일
+        """
+        try:
+            days = int(request.query_params.get("days", PRICE_WINDOW_DAYS))
+        except ValueError:
+            return Response(
+                {"error": "days는 숫자여야 합니다"}, status=status.HTTP_400_BAD_REQUEST
+            )
+        if not 1 <= days <= PRICE_MAX_WINDOW_DAYS:
+            return Response(
+                {"error": f"days는 1~{PRICE_MAX_WINDOW_DAYS} 사이여야 합니다"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        missing_ingredients = get_missing_ingredients(request, article_id)
+        return Response(
+            {"results": price_summary(missing_ingredients, days), "days": days},
+            status=status.HTTP_200_OK,
+        )
@@ -113,6 +113,15 @@ STATIC_URL = "/static/"
 STATIC_ROOT = BASE_DIR / "static"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
+# 협업 필터링 모델(.npy) 저장 위치. ai_process/collaborative.py 참고
+RECOMMEND_MODEL_DIR = BASE_DIR / "recommend_models"
+# 재료 구매 링크 일괄 갱신 진행 상황. articles/coupang.py 참고
+INGREDIENT_LINK_CHECKPOINT = BASE_DIR / "job_state" / "update_ingredient_links.json"
+# 재료 사물인식 백엔드(roboflow, local). ai_process/detection.py 참고
+DETECTION_BACKEND = os.environ.get("DETECTION_BACKEND", "roboflow")
+DETECTION_MODEL_PATH = os.environ.get(
+    "DETECTION_MODEL_PATH", BASE_DIR / "detection_models" / "cookai.onnx"
+)
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
@@ -0,0 +1,63 @@
+"""냉장고 일괄 추가
+
+사물인식 결과처럼 여러 재료를 한 번에 냉장고에 넣을 때
+재료마다 조회/생성/추가 쿼리를 보내지 않고 IN 쿼리와 bulk_create로 처리합니다.
+"""
+from django.db import transaction
+from ai_process.recommend_cache import recommend_cache
+from articles.ingredient_search import ingredient_name_index
+from articles.models import Ingredient
+from .models import Fridge
+
+# Ingredient.ingredient_name 최대 길이
+INGREDIENT_NAME_LENGTH = 100
+
+
+def clean_ingredient_names(names):
+    """앞뒤 공백을 지우고 빈 값/중복을 뺀 재료 이름 목록 (입력 순서 유지)"""
+    cleaned = (name.strip() for name in names)
+    return list(dict.fromkeys(name for name in cleaned if name))
+
+
+def import_fridge(user, names):
+    """재료 이름 목록을 유저의 냉장고에 추가합니다.
+
+    없는 재료는 새로 만들고, 이미 냉장고에 있는 재료는 건너뜁니다.
+
+    Args:
+        user(User) : 냉장고 주인
+        names(list) : 재료 이름(str) 목록
+    return:
+        새로 추가된 재료 이름 목록
+    """
+    names = clean_ingredient_names(names)
+    if not names:
+        return []
+    with transaction.atomic():
+        existing = set(
+            Ingredient.objects.filter(ingredient_name__in=names).values_list(
+                "ingredient_name", flat=True
+            )
+        )
+        new_names = [name for name in names if name not in existing]
+        Ingredient.objects.bulk_create(
+            [Ingredient(ingredient_name=name) for name in new_names],
+            ignore_conflicts=True,
+        )
+        owned = set(
+            Fridge.objects.filter(user=user, ingredient_id__in=names).values_list(
+                "ingredient_id", flat=True
+            )
+        )
+        added = [name for name in names if name not in owned]
+        # 동시에 같은 재료를 추가한 요청이 있으면 unique 제약에 걸린 행은 건너뜁니다.
+        Fridge.objects.bulk_create(
+            [Fridge(user=user, ingredient_id=name) for name in added],
+            ignore_conflicts=True,
+        )
+    # bulk_create는 post_save를 보내지 않으므로 재료 색인과 추천 캐시를 직접 갱신합니다.
+    if new_names:
+        ingredient_name_index.add(new_names)
+    if added:
+        recommend_cache.invalidate_user(user.id)
+    return added
@@ -161,3 +161,10 @@ class Fridge(models.Model):
 
     class Meta:
         verbose_name_plural = "Fridges"
+        # 같은 재료는 냉장고에 한 번만 (동시에 일괄 추가해도 중복 없음)
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "ingredient"],
+                name="unique_fridge_ingredient",
+            ),
+        ]
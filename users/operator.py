@@ -8,6 +8,9 @@ from django_apscheduler.jobstores import DjangoJobStore
 from django_apscheduler.models import DjangoJobExecution
 from django_apscheduler import util
 from articles.coupang import update_ingredient_links
+from articles.counters import reconcile_counters
+from ai_process.collaborative import build_collaborative_model
+from ai_process.trending import refresh_trending_articles
 from .models import User
 
 logger = logging.getLogger(__name__)
@@ -54,6 +57,7 @@ class Command(BaseCommand):
         )
         logger.info("Added job 'delete_dormant_user'.")
 
+        # 중간에 끝나면 다음 실행에서 체크포인트부터 이어서 갱신합니다.
         scheduler.add_job(
             update_ingredient_links,
             trigger=CronTrigger(day_of_week="0-6", hour="04", minute="00"),
@@ -63,6 +67,30 @@ class Command(BaseCommand):
         )
 
         logger.info("Added job 'update_ingredient_links'.")
+        scheduler.add_job(
+            build_collaborative_model,
+            trigger=CronTrigger(hour="*", minute="30"),  # 매시 30분에 추천 모델 재학습
+            id="build_collaborative_model",
+            max_instances=1,
+            replace_existing=True,
+        )
+        logger.info("Added hourly job 'build_collaborative_model'.")
+        scheduler.add_job(
+            refresh_trending_articles,
+            trigger=CronTrigger(minute="*/10"),  # 10분마다 인기 게시글 재계산
+            id="refresh_trending_articles",
+            max_instances=1,
+            replace_existing=True,
+        )
+        logger.info("Added job 'refresh_trending_articles'.")
+        scheduler.add_job(
+            reconcile_counters,
+            trigger=CronTrigger(day_of_week="0-6", hour="04", minute="30"),
+            id="reconcile_counters",  # 좋아요/북마크/댓글 수 컬럼 보정
+            max_instances=1,
+            replace_existing=True,
+        )
+        logger.info("Added job 'reconcile_counters'.")
         scheduler.add_job(
             delete_old_job_executions,
             trigger=CronTrigger(
@@ -15,7 +15,42 @@ from .models import User, Fridge
 from .email_tokens import account_activation_token
 
 
-class UserSerializer(ModelSerializer):
+class UserStatsMixin:
+    """프로필 통계 필드
+
+    users.stats.with_profile_stats로 annotate된 값이 있으면 그대로 쓰고,
+    없으면(저장 직후 등) 직접 셉니다.
+    """
+
+    def get_stat(self, user, name, related):
+        value = getattr(user, name, None)
+        if value is None:
+            value = related.count()
+        return value
+
+    def get_total_comments(self, user):
+        return self.get_stat(user, "total_comments", user.comments)
+
+    def get_total_articles(self, user):
+        return self.get_stat(user, "total_articles", user.article_set)
+
+    def get_total_like_articles(self, user):
+        return self.get_stat(user, "total_like_articles", user.likes)
+
+    def get_total_like_comments(self, user):
+        return self.get_stat(user, "total_like_comments", user.like_comments)
+
+    def get_total_bookmark_articles(self, user):
+        return self.get_stat(user, "total_bookmark_articles", user.bookmarks)
+
+    def get_total_followings(self, user):
+        return self.get_stat(user, "total_followings", user.followings)
+
+    def get_total_followers(self, user):
+        return self.get_stat(user, "total_followers", user.followers)
+
+
+class UserSerializer(UserStatsMixin, ModelSerializer):
     is_host = SerializerMethodField()
     total_comments = SerializerMethodField()
     total_articles = SerializerMethodField()
@@ -73,29 +108,8 @@ class UserSerializer(ModelSerializer):
 
         return request.user.id == user.id
 
-    def get_total_comments(self, user):
-        return user.comments.count()
-
-    def get_total_articles(self, user):
-        return user.article_set.count()
-
-    def get_total_like_articles(self, user):
-        return user.likes.count()
-
-    def get_total_like_comments(self, user):
-        return user.like_comments.count()
-
-    def get_total_bookmark_articles(self, user):
-        return user.bookmarks.count()
-
-    def get_total_followings(self, user):
-        return user.followings.count()
-
-    def get_total_followers(self, user):
-        return user.followers.count()
-
 
-class PublicUserSerializer(ModelSerializer):
+class PublicUserSerializer(UserStatsMixin, ModelSerializer):
     is_host = SerializerMethodField()
     total_comments = SerializerMethodField()
     total_articles = SerializerMethodField()
@@ -128,27 +142,6 @@ class PublicUserSerializer(ModelSerializer):
 
         return request.user.id == user.id
 
-    def get_total_comments(self, user):
-        return user.comments.count()
-
-    def get_total_articles(self, user):
-        return user.article_set.count()
-
-    def get_total_like_articles(self, user):
-        return user.likes.count()
-
-    def get_total_like_comments(self, user):
-        return user.like_comments.count()
-
-    def get_total_bookmark_articles(self, user):
-        return user.bookmarks.count()
-
-    def get_total_followings(self, user):
-        return user.followings.count()
-
-    def get_total_followers(self, user):
-        return user.followers.count()
-
 
 class UserFridgeSerializer(ModelSerializer):
     class Meta:
@@ -172,6 +165,9 @@ class UserFridgeSerializer(ModelSerializer):
         except Ingredient.DoesNotExist:
             ingredient = Ingredient.objects.create(ingredient_name=ingredient_name)
             ingredient.save()
+        user = kwargs.get("user")
+        if Fridge.objects.filter(user=user, ingredient_id=ingredient_name).exists():
+            raise ValidationError({"ingredient": "이미 냉장고에 있는 재료입니다"})
         return super().save(**kwargs)
 
 
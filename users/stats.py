@@ -0,0 +1,28 @@
+"""유저 프로필 통계
+
+UserSerializer/PublicUserSerializer의 total_* 값을
+유저마다 COUNT를 따로 보내지 않고 한 번의 쿼리로 annotate합니다.
+"""
+from articles.counters import count_subquery
+from articles.models import Article, Comment
+from .models import User
+
+PROFILE_STATS = {
+    "total_comments": (Comment.objects.all(), "author_id"),
+    "total_articles": (Article.objects.all(), "author_id"),
+    "total_like_articles": (Article.like.through.objects.all(), "user_id"),
+    "total_like_comments": (Comment.like.through.objects.all(), "user_id"),
+    "total_bookmark_articles": (Article.bookmark.through.objects.all(), "user_id"),
+    "total_followings": (User.followings.through.objects.all(), "from_user_id"),
+    "total_followers": (User.followings.through.objects.all(), "to_user_id"),
+}
+
+
+def with_profile_stats(queryset):
+    """프로필 통계와 팔로잉 목록을 함께 불러오는 queryset을 반환합니다."""
+    return queryset.annotate(
+        **{
+            name: count_subquery(related, field)
+            for name, (related, field) in PROFILE_STATS.items()
+        }
+    ).prefetch_related("followings")
@@ -0,0 +1,75 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from articles.models import Ingredient
+from users.fridge import import_fridge
+from users.models import Fridge, User
+
+
+class FridgeBulkImportTestCase(APITestCase):
+    url = "/users/fridge/bulk/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="testuser", email="testuser@gmail.com", password="xptmxm111!"
+        )
+        Ingredient.objects.create(ingredient_name="감자")
+        Fridge.objects.create(user=cls.user, ingredient_id="감자")
+
+    def fridge_names(self):
+        return sorted(
+            Fridge.objects.filter(user=self.user).values_list(
+                "ingredient_id", flat=True
+            )
+        )
+
+    def test_bulk_import(self):
+        """정상: 없는 재료는 만들고, 냉장고에 있는 재료/중복 이름은 건너뜀"""
+        self.client.force_authenticate(self.user)
+        response = self.client.post(
+            self.url,
+            {"ingredients": ["감자", " 양파 ", "양파", "", "마늘"]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data), 3)
+        self.assertEqual(self.fridge_names(), ["감자", "마늘", "양파"])
+        self.assertEqual(
+            Ingredient.objects.filter(ingredient_name__in=["양파", "마늘"]).count(), 2
+        )
+        self.assertEqual(import_fridge(self.user, ["감자", "양파"]), [])
+
+    def test_constant_queries(self):
+        """정상: 재료 개수와 관계없이 쿼리 수가 같음"""
+        query_counts = []
+        for names in (["a1", "a2"], [f"b{i}" for i in range(20)]):
+            with CaptureQueriesContext(connection) as context:
+                self.assertEqual(import_fridge(self.user, names), names)
+            query_counts.append(len(context.captured_queries))
+        self.assertEqual(query_counts[0], query_counts[1])
+
+    def test_invalid_requests(self):
+        """에러: 목록이 아니거나 비었거나, 너무 많거나, 문자열이 아니거나, 이름이 너무 긺"""
+        self.client.force_authenticate(self.user)
+        for ingredients in (
+            "감자",
+            [],
+            [f"재료{i}" for i in range(101)],
+            ["양파", 3],
+            ["양파", None],
+            ["가" * 101],
+        ):
+            response = self.client.post(
+                self.url, {"ingredients": ingredients}, format="json"
+            )
+            self.assertEqual(response.status_code, 400, ingredients)
+        self.assertEqual(self.fridge_names(), ["감자"])
+        self.assertFalse(Ingredient.objects.filter(ingredient_name="3").exists())
+
+    def test_single_add_duplicate(self):
+        """에러: 냉장고에 이미 있는 재료를 하나씩 추가하면 400"""
+        self.client.force_authenticate(self.user)
+        response = self.client.post("/users/fridge/", {"ingredient": "감자"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.fridge_names(), ["감자"])
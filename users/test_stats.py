@@ -0,0 +1,85 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from articles.models import Article, Category, Comment
+from users.models import User
+
+
+class ProfileStatsTestCase(APITestCase):
+    """유저 목록/팔로우 목록의 total_* 통계
+
+    유저 수와 관계없이 쿼리 수가 같고, 값은 실제 개수와 같아야 합니다.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.host = User.objects.create_user(
+            username="host", email="host@gmail.com", password="xptmxm111!"
+        )
+        cls.category = Category.objects.create(name="한식", info="한식")
+
+    def add_users(self, count):
+        """팔로우, 게시글, 댓글, 좋아요, 북마크가 있는 유저 count명을 추가합니다."""
+        for _ in range(count):
+            index = User.objects.count()
+            user = User.objects.create_user(
+                username=f"testuser{index}",
+                email=f"testuser{index}@gmail.com",
+                password="xptmxm111!",
+            )
+            self.host.followings.add(user)
+            user.followings.add(self.host)
+            article = Article.objects.create(
+                author=user, category=self.category, title=f"title{index}"
+            )
+            comment = Comment.objects.create(
+                author=user, article=article, comment="맛있어요"
+            )
+            article.like.add(user, self.host)
+            article.bookmark.add(user)
+            comment.like.add(user)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries), response
+
+    def test_constant_queries(self):
+        """정상: 유저가 늘어도 유저 목록/팔로우 목록 쿼리 수는 같음"""
+        self.client.force_authenticate(self.host)
+        urls = ("/users/", f"/users/{self.host.pk}/follow/?filter=0")
+        self.add_users(2)
+        before = [self.count_queries(url)[0] for url in urls]
+        self.add_users(4)
+        after = [self.count_queries(url)[0] for url in urls]
+        self.assertEqual(before, after)
+
+    def test_stats_match_counts(self):
+        """정상: total_* 값이 실제 개수와 같음"""
+        self.client.force_authenticate(self.host)
+        self.add_users(3)
+        _, response = self.count_queries("/users/")
+        stats = {user["id"]: user for user in response.data}
+        for user in User.objects.all():
+            self.assertEqual(
+                {
+                    name: value
+                    for name, value in stats[user.pk].items()
+                    if "total" in name
+                },
+                {
+                    "total_comments": user.comments.count(),
+                    "total_articles": user.article_set.count(),
+                    "total_like_articles": user.likes.count(),
+                    "total_like_comments": user.like_comments.count(),
+                    "total_bookmark_articles": user.bookmarks.count(),
+                    "total_followings": user.followings.count(),
+                    "total_followers": user.followers.count(),
+                },
+            )
+        _, response = self.count_queries(f"/users/{self.host.pk}/follow/?filter=1")
+        self.assertEqual(len(response.data["results"]), 3)
+        for data in response.data["results"]:
+            self.assertEqual(data["total_followings"], 1)
+            self.assertEqual(data["total_articles"], 1)
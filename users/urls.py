@@ -50,6 +50,11 @@ urlpatterns = [
         views.UserDetailFridgeView.as_view(),
         name="user_fridge",
     ),
+    path(
+        "fridge/bulk/",
+        views.UserFridgeBulkView.as_view(),
+        name="user_fridge_bulk",
+    ),
     path(
         "fridge/<int:fridge_id>/",
         views.UserDetailFridgeView.as_view(),
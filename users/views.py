@@ -1,7 +1,6 @@
 import re
 import requests
 from django.db import transaction
-from django.db.models import Count
 from django.conf import settings
 from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
 from django.utils.encoding import force_bytes, force_str
@@ -31,6 +30,8 @@ from articles.serializers import ArticleListSerializer, CommentSerializer
 from articles.models import Article, Comment
 from articles.paginations import ArticlePagination
 from users.models import User, Fridge
+from users.stats import with_profile_stats
+from users.fridge import INGREDIENT_NAME_LENGTH, import_fridge
 from users.validators import validate_password
 from users.users_paginations import UserCommentPagination, UserFollowPagination
 from users.email_tokens import account_activation_token
@@ -40,8 +41,8 @@ class UserView(APIView):
     # """유저전체보기, 주석 추가 예정"""
 
     def get(self, request):
-        user = User.objects.all()
-        serializer = UserSerializer(user, many=True)
+        user = with_profile_stats(User.objects.all())
+        serializer = UserSerializer(user, many=True, context={"request": request})
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     def post(self, request):
@@ -517,7 +518,7 @@ class UserDetailView(APIView):
     def get(self, request, user_id):
         # """유저 프로필 조회 주석 추가 예정"""
 
-        user = get_object_or_404(User, id=user_id)
+        user = get_object_or_404(with_profile_stats(User.objects.all()), id=user_id)
         if request.user.id == user_id:
             serializer = UserSerializer(
                 user,
@@ -602,11 +603,11 @@ class UserDetailArticlesView(generics.ListAPIView):
         }
         query_key = self.request.GET.get("filter", None)
         order = self.request.GET.get("order", None)
-        queryset = query_types.get(query_key, self.my_article)()
+        queryset = query_types.get(query_key, self.my_article)().select_related(
+            "author"
+        )
         if order == "1":
-            queryset = queryset.annotate(like_count=Count("like")).order_by(
-                "-like_count"
-            )
+            queryset = queryset.order_by("-like_count")
         else:
             queryset = queryset.order_by("-created_at")
         return queryset
@@ -634,11 +635,13 @@ class UserDetailCommentsView(generics.ListAPIView):
         }
         query_key = self.request.GET.get("filter", None)
         order = self.request.GET.get("order", None)
-        queryset = query_types.get(query_key, self.my_comment)()
+        queryset = (
+            query_types.get(query_key, self.my_comment)()
+            .select_related("author")
+            .prefetch_related("like")
+        )
         if order == "1":
-            queryset = queryset.annotate(like_count=Count("like")).order_by(
-                "-like_count"
-            )
+            queryset = queryset.order_by("-like_count")
         else:
             queryset = queryset.order_by("-created_at")
         return queryset
@@ -697,6 +700,43 @@ class UserDetailFridgeView(APIView):
             raise NotFound
 
 
+class UserFridgeBulkView(APIView):
+    """냉장고 재료 일괄 추가
+
+    {"ingredients": ["감자", "양파", ...]}를 받아 없는 재료만 냉장고에 추가하고
+    전체 냉장고 목록을 반환합니다. (사물인식 결과 저장용)
+    """
+
+    permission_classes = [IsAuthenticated]
+    max_ingredients = 100
+
+    def post(self, request):
+        names = request.data.get("ingredients")
+        if not isinstance(names, list) or not names:
+            return Response(
+                {"error": "재료 목록을 입력해주세요"}, status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(names) > self.max_ingredients:
+            return Response(
+                {"error": f"재료는 한 번에 {self.max_ingredients}개까지 추가할 수 있습니다"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not all(isinstance(name, str) for name in names):
+            return Response(
+                {"error": "재료 이름은 문자열이어야 합니다"}, status=status.HTTP_400_BAD_REQUEST
+            )
+        if any(len(name.strip()) > INGREDIENT_NAME_LENGTH for name in names):
+            return Response(
+                {"error": "재료 이름이 너무 깁니다"}, status=status.HTTP_400_BAD_REQUEST
+            )
+        import_fridge(request.user, names)
+        serializer = UserFridgeSerializer(
+            Fridge.objects.filter(user=request.user),
+            many=True,
+        )
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
 class UserFollowView(APIView):
     """팔로우한 유저 조회, 유저 팔로우 토글. 주석추가예정"""
 
@@ -707,7 +747,7 @@ class UserFollowView(APIView):
         user = get_object_or_404(User, id=user_id)
 
         serializer = UserSerializer(
-            user.followings,
+            with_profile_stats(user.followings.all()),
             many=True,
             context={"request": request},
         )
@@ -739,7 +779,7 @@ class UserFollowerView(APIView):
         """팔로우한 유저들 조회"""
         user = get_object_or_404(User, id=user_id)
         serializer = UserSerializer(
-            user.followers,
+            with_profile_stats(user.followers.all()),
             many=True,
             context={"request": request},
         )
@@ -767,7 +807,7 @@ class UserDetailFollowView(generics.ListAPIView):
         }
         query_key = self.request.GET.get("filter", None)
         queryset = query_types.get(query_key, self.my_followings)()
-        return queryset
+        return with_profile_stats(queryset).order_by("pk")
 
     def get(self, request, *args, **kwargs):
         self.user_id = kwargs.get("user_id", None)